@@ -1,30 +1,184 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Query
 from core.celery_app import celery_app
+from core.config import settings
+from celery import states
 from celery.result import AsyncResult
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# Shared inspect instance; broadcasts reuse the app's broker connection pool
+INSPECT = celery_app.control.inspect(timeout=settings.celery_inspect_timeout)
+
+INSPECT_METHODS = ('stats', 'active', 'scheduled', 'reserved', 'registered')
+
+# Refresh cycles the snapshot may miss (e.g. broker down) before it is
+# treated as unavailable rather than served as current
+STALE_AFTER_REFRESHES = 5
+
+@dataclass(frozen=True)
+class InspectSnapshot:
+    """Worker replies for every inspect method, taken together"""
+    stats: Dict[str, Any] = field(default_factory=dict)
+    active: Dict[str, Any] = field(default_factory=dict)
+    scheduled: Dict[str, Any] = field(default_factory=dict)
+    reserved: Dict[str, Any] = field(default_factory=dict)
+    registered: Dict[str, Any] = field(default_factory=dict)
+    registered_names: List[str] = field(default_factory=list)  # Union across workers
+    updated_at: Optional[datetime] = None
+    stale: bool = False  # Refresher stopped succeeding; replies withheld
+
+
+# Latest snapshot, replaced wholesale by the refresher so readers never see a
+# partial update. Endpoints read it instead of broadcasting to the workers.
+_SNAPSHOT = InspectSnapshot()
+_snapshot_lock = asyncio.Lock()
+_refresh_task: Optional[asyncio.Task] = None
+
+
+def _inspect(method: str) -> Dict[str, Any]:
+    """Run a Celery inspect method (blocks until workers reply or time out)"""
+    return getattr(INSPECT, method)() or {}
+
+
+async def refresh_snapshot() -> InspectSnapshot:
+    """
+    Broadcast every inspect method once and publish the replies
+    
+    The broadcasts run concurrently in worker threads so they do not block
+    the event loop.
+    
+    Returns:
+        The new snapshot
+    """
+    global _SNAPSHOT
+    async with _snapshot_lock:
+        replies = await asyncio.gather(
+            *[asyncio.to_thread(_inspect, method) for method in INSPECT_METHODS]
+        )
+        snapshot = dict(zip(INSPECT_METHODS, replies))
+        _SNAPSHOT = InspectSnapshot(
+            **snapshot,
+            # Computed once per refresh rather than on every /stats request
+            registered_names=sorted(set().union(*snapshot['registered'].values())),
+            updated_at=datetime.now()
+        )
+        return _SNAPSHOT
+
+
+async def get_snapshot() -> InspectSnapshot:
+    """
+    Get the latest snapshot, taking the first one if none exists yet
+    
+    A snapshot the refresher has not replaced for STALE_AFTER_REFRESHES
+    cycles is returned empty and marked stale, so workers that may be gone
+    are not reported as online.
+    """
+    if _SNAPSHOT.updated_at is None:
+        return await refresh_snapshot()
+    
+    refresh_cycle = settings.celery_inspect_refresh_interval + settings.celery_inspect_timeout
+    if datetime.now() - _SNAPSHOT.updated_at > timedelta(seconds=refresh_cycle * STALE_AFTER_REFRESHES):
+        return InspectSnapshot(updated_at=_SNAPSHOT.updated_at, stale=True)
+    return _SNAPSHOT
+
+
+def _freshness(snapshot: InspectSnapshot) -> Dict[str, Any]:
+    """Response fields telling clients when the worker replies were taken"""
+    return {
+        "updated_at": snapshot.updated_at,
+        "stale": snapshot.stale
+    }
+
+
+async def _refresh_inspect_loop() -> None:
+    """Keep the snapshot fresh for the lifetime of the app"""
+    while True:
+        try:
+            await refresh_snapshot()
+        except Exception as e:
+            logger.warning(f"Error refreshing Celery inspect snapshot: {str(e)}")
+        await asyncio.sleep(settings.celery_inspect_refresh_interval)
+
+
+def start_inspect_refresher() -> None:
+    """Start the background snapshot refresher (call from app startup)"""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_inspect_loop())
+
+
+async def stop_inspect_refresher() -> None:
+    """Stop the background snapshot refresher (call from app shutdown)"""
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+
+
+def _task_status(task_id: str) -> Dict[str, Any]:
+    """Build the status payload for a task (reads from the result backend)"""
+    result = AsyncResult(task_id, app=celery_app)
+    
+    # Each ready()/successful()/failed() call re-reads the backend, so read
+    # the state once and derive the flags from it
+    state = result.state
+    ready = state in states.READY_STATES
+    
+    task_info = {
+        "id": task_id,
+        "status": state,
+        "ready": ready,
+        "successful": state == states.SUCCESS if ready else None,
+        "failed": state == states.FAILURE if ready else None,
+    }
+    
+    # Add result or error info if task is complete
+    if state == states.SUCCESS:
+        task_info["result"] = result.result
+    elif state == states.FAILURE:
+        task_info["error"] = str(result.info)
+    
+    return task_info
+
 
 @router.get("/workers")
-async def get_workers():
+async def get_workers(
+    detailed: bool = Query(
+        False,
+        description="Include per-worker stats and task counts"
+    )
+):
     """Get information about active Celery workers"""
     try:
-        # Get active workers
-        inspect = celery_app.control.inspect()
-        
-        # Get worker stats
-        stats = inspect.stats()
-        active = inspect.active()
-        registered = inspect.registered()
+        snapshot = await get_snapshot()
+        stats, active, registered = snapshot.stats, snapshot.active, snapshot.registered
         
         if not stats:
             return {
                 "workers": [],
                 "total": 0,
-                "message": "No active workers found"
+                "message": "Worker status unavailable" if snapshot.stale else "No active workers found",
+                **_freshness(snapshot)
+            }
+        
+        if not detailed:
+            # Liveness only: names of the workers that replied
+            workers = [{"name": worker_name, "status": "online"} for worker_name in stats]
+            return {
+                "workers": workers,
+                "total": len(workers),
+                **_freshness(snapshot)
             }
         
         workers = []
@@ -40,7 +194,8 @@ async def get_workers():
         
         return {
             "workers": workers,
-            "total": len(workers)
+            "total": len(workers),
+            **_freshness(snapshot)
         }
         
     except Exception as e:
@@ -55,32 +210,36 @@ async def get_workers():
 async def get_active_tasks():
     """Get currently active/running tasks"""
     try:
-        inspect = celery_app.control.inspect()
-        active = inspect.active()
+        snapshot = await get_snapshot()
+        active = snapshot.active
         
         if not active:
             return {
                 "tasks": [],
                 "total": 0,
-                "message": "No active tasks"
+                "message": "Task status unavailable" if snapshot.stale else "No active tasks",
+                **_freshness(snapshot)
             }
         
-        all_tasks = []
-        for worker_name, tasks in active.items():
-            for task in tasks:
-                task_info = {
-                    "id": task.get('id'),
-                    "name": task.get('name'),
-                    "worker": worker_name,
-                    "args": task.get('args'),
-                    "kwargs": task.get('kwargs'),
-                    "time_start": task.get('time_start')
-                }
-                all_tasks.append(task_info)
+        # Replies come from remote, possibly older workers, so fields are
+        # read with .get() and a partial reply does not fail the request
+        all_tasks = [
+            {
+                "id": task.get('id'),
+                "name": task.get('name'),
+                "worker": worker_name,
+                "args": task.get('args'),
+                "kwargs": task.get('kwargs'),
+                "time_start": task.get('time_start')
+            }
+            for worker_name, tasks in active.items()
+            for task in tasks
+        ]
         
         return {
             "tasks": all_tasks,
-            "total": len(all_tasks)
+            "total": len(all_tasks),
+            **_freshness(snapshot)
         }
         
     except Exception as e:
@@ -95,38 +254,36 @@ async def get_active_tasks():
 async def get_scheduled_tasks():
     """Get scheduled/reserved tasks"""
     try:
-        inspect = celery_app.control.inspect()
-        scheduled = inspect.scheduled()
-        reserved = inspect.reserved()
-        
-        all_tasks = []
-        
-        if scheduled:
-            for worker_name, tasks in scheduled.items():
-                for task in tasks:
-                    task_info = {
-                        "id": task.get('request', {}).get('id'),
-                        "name": task.get('request', {}).get('name'),
-                        "worker": worker_name,
-                        "eta": task.get('eta'),
-                        "status": "scheduled"
-                    }
-                    all_tasks.append(task_info)
-        
-        if reserved:
-            for worker_name, tasks in reserved.items():
-                for task in tasks:
-                    task_info = {
-                        "id": task.get('id'),
-                        "name": task.get('name'),
-                        "worker": worker_name,
-                        "status": "reserved"
-                    }
-                    all_tasks.append(task_info)
+        snapshot = await get_snapshot()
+        scheduled, reserved = snapshot.scheduled, snapshot.reserved
+        
+        # Fields are read with .get(), as for active tasks
+        all_tasks = [
+            {
+                "id": task.get('request', {}).get('id'),
+                "name": task.get('request', {}).get('name'),
+                "worker": worker_name,
+                "eta": task.get('eta'),
+                "status": "scheduled"
+            }
+            for worker_name, tasks in scheduled.items()
+            for task in tasks
+        ]
+        all_tasks.extend(
+            {
+                "id": task.get('id'),
+                "name": task.get('name'),
+                "worker": worker_name,
+                "status": "reserved"
+            }
+            for worker_name, tasks in reserved.items()
+            for task in tasks
+        )
         
         return {
             "tasks": all_tasks,
-            "total": len(all_tasks)
+            "total": len(all_tasks),
+            **_freshness(snapshot)
         }
         
     except Exception as e:
@@ -141,24 +298,7 @@ async def get_scheduled_tasks():
 async def get_task_status(task_id: str):
     """Get status of a specific task by ID"""
     try:
-        result = AsyncResult(task_id, app=celery_app)
-        
-        task_info = {
-            "id": task_id,
-            "status": result.status,
-            "ready": result.ready(),
-            "successful": result.successful() if result.ready() else None,
-            "failed": result.failed() if result.ready() else None,
-        }
-        
-        # Add result or error info if task is complete
-        if result.ready():
-            if result.successful():
-                task_info["result"] = result.result
-            elif result.failed():
-                task_info["error"] = str(result.info)
-        
-        return task_info
+        return await asyncio.to_thread(_task_status, task_id)
         
     except Exception as e:
         logger.error(f"Error fetching task status: {str(e)}")
@@ -172,13 +312,9 @@ async def get_task_status(task_id: str):
 async def get_celery_stats():
     """Get overall Celery statistics"""
     try:
-        inspect = celery_app.control.inspect()
-        
-        stats = inspect.stats()
-        active = inspect.active()
-        scheduled = inspect.scheduled()
-        reserved = inspect.reserved()
-        registered = inspect.registered()
+        snapshot = await get_snapshot()
+        stats, active = snapshot.stats, snapshot.active
+        scheduled, reserved = snapshot.scheduled, snapshot.reserved
         
         # Count totals
         total_workers = len(stats) if stats else 0
@@ -186,12 +322,6 @@ async def get_celery_stats():
         total_scheduled = sum(len(tasks) for tasks in scheduled.values()) if scheduled else 0
         total_reserved = sum(len(tasks) for tasks in reserved.values()) if reserved else 0
         
-        # Get registered task names
-        all_registered_tasks = set()
-        if registered:
-            for tasks in registered.values():
-                all_registered_tasks.update(tasks)
-        
         return {
             "workers": {
                 "total": total_workers,
@@ -201,12 +331,13 @@ async def get_celery_stats():
                 "active": total_active,
                 "scheduled": total_scheduled,
                 "reserved": total_reserved,
-                "registered": list(all_registered_tasks)
+                "registered": snapshot.registered_names
             },
             "broker": {
                 "url": celery_app.conf.broker_url,
                 "transport": celery_app.conf.broker_transport
-            }
+            },
+            **_freshness(snapshot)
         }
         
     except Exception as e:
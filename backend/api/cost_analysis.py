@@ -1,127 +1,184 @@
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
-from typing import Dict, List
+from fastapi.responses import JSONResponse, StreamingResponse
+from typing import Dict, List, Optional
+from functools import lru_cache
+from collections import Counter, defaultdict
+import asyncio
 import io
+import jmespath
+import math
+import time
 from datetime import datetime, timedelta
-import boto3
 from botocore.exceptions import ClientError
+from celery import states
+from celery.result import AsyncResult
 from core.aws_client import get_aws_client_factory
-from core.cache import get_cache
+from core.cache import get_redis_client, get_shared, set_shared
+from core.celery_app import celery_app
+from core.config import settings
+from core.stopped_instances import fetch_unused_instances
+from core.pricing_catalog import DEFAULT_LOCATION, HOURS_PER_MONTH, PRICE_TABLE, REGION_NAMES, parse_on_demand_price, sync_price_table
+
+try:
+    from reportlab.lib.pagesizes import letter
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib.units import inch
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
+    from reportlab.lib import colors
+    REPORTLAB_AVAILABLE = True
+except ImportError:
+    REPORTLAB_AVAILABLE = False
 
 router = APIRouter()
 
+COST_CACHE_PREFIX = 'cc:cost:'
+COST_READ_PREFIX = 'cc:cost-read:'
+PDF_CACHE_PREFIX = 'cc:pdf:'
+CE_CACHE_PREFIX = 'cc:ce:'
+
+# One build per region at a time; stale regions being rebuilt in the background
+_cost_locks: Dict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+_revalidating: Dict[str, asyncio.Task] = {}
+
 def get_pricing_client():
-    """Get AWS Pricing API client (us-east-1 only)"""
-    return boto3.client('pricing', region_name='us-east-1')
+    """Get AWS Pricing API client (us-east-1 only), shared across threads"""
+    return get_aws_client_factory().get_client('pricing', 'us-east-1')
 
 def get_cost_explorer_client():
     """Get AWS Cost Explorer client"""
-    return boto3.client('ce', region_name='us-east-1')
+    return get_aws_client_factory().get_client('ce', 'us-east-1')
+
+@lru_cache(maxsize=4096)
+def _live_ec2_price(instance_type: str, region: str) -> Optional[float]:
+    """Fetch monthly EC2 instance pricing from AWS Pricing API (errors are not cached)"""
+    pricing_client = get_pricing_client()
+    
+    response = pricing_client.get_products(
+        ServiceCode='AmazonEC2',
+        Filters=[
+            {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type},
+            {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': REGION_NAMES.get(region, DEFAULT_LOCATION)},
+            {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': 'Linux'},
+            {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'Shared'},
+            {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
+            {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'}
+        ],
+        MaxResults=1
+    )
+    
+    if response['PriceList']:
+        price_per_hour = parse_on_demand_price(response['PriceList'][0])
+        # Convert to monthly (730 hours average)
+        return price_per_hour * HOURS_PER_MONTH if price_per_hour is not None else None
+    
+    return None
+
+@lru_cache(maxsize=256)
+def _live_ebs_price(region: str, volume_type: str) -> Optional[float]:
+    """Fetch EBS pricing per GB from AWS Pricing API (errors are not cached)"""
+    pricing_client = get_pricing_client()
+    
+    response = pricing_client.get_products(
+        ServiceCode='AmazonEC2',
+        Filters=[
+            {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'Storage'},
+            {'Type': 'TERM_MATCH', 'Field': 'volumeApiName', 'Value': volume_type},
+            {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': REGION_NAMES.get(region, DEFAULT_LOCATION)}
+        ],
+        MaxResults=1
+    )
+    
+    if response['PriceList']:
+        return parse_on_demand_price(response['PriceList'][0])
+    
+    return None
+
+@lru_cache(maxsize=1)
+def _live_s3_price() -> Optional[float]:
+    """Fetch S3 pricing per GB from AWS Pricing API (errors are not cached)"""
+    pricing_client = get_pricing_client()
+    
+    response = pricing_client.get_products(
+        ServiceCode='AmazonS3',
+        Filters=[
+            {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'Storage'},
+            {'Type': 'TERM_MATCH', 'Field': 'storageClass', 'Value': 'General Purpose'},
+            {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': DEFAULT_LOCATION}
+        ],
+        MaxResults=1
+    )
+    
+    if response['PriceList']:
+        return parse_on_demand_price(response['PriceList'][0])
+    
+    return None
 
 def get_ec2_pricing(instance_type: str, region: str = 'us-east-1') -> float:
-    """Get EC2 instance pricing from AWS Pricing API"""
+    """Get monthly EC2 instance pricing from the price catalog or AWS Pricing API"""
+    catalog_price = PRICE_TABLE.get('ec2', {}).get(region, {}).get(instance_type)
+    if catalog_price is not None:
+        return catalog_price
+    
     try:
-        pricing_client = get_pricing_client()
-        
-        response = pricing_client.get_products(
-            ServiceCode='AmazonEC2',
-            Filters=[
-                {'Type': 'TERM_MATCH', 'Field': 'instanceType', 'Value': instance_type},
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': get_region_name(region)},
-                {'Type': 'TERM_MATCH', 'Field': 'operatingSystem', 'Value': 'Linux'},
-                {'Type': 'TERM_MATCH', 'Field': 'tenancy', 'Value': 'Shared'},
-                {'Type': 'TERM_MATCH', 'Field': 'preInstalledSw', 'Value': 'NA'},
-                {'Type': 'TERM_MATCH', 'Field': 'capacitystatus', 'Value': 'Used'}
-            ],
-            MaxResults=1
-        )
-        
-        if response['PriceList']:
-            import json
-            price_data = json.loads(response['PriceList'][0])
-            on_demand = price_data['terms']['OnDemand']
-            price_dimensions = list(on_demand.values())[0]['priceDimensions']
-            price_per_hour = float(list(price_dimensions.values())[0]['pricePerUnit']['USD'])
-            # Convert to monthly (730 hours average)
-            return price_per_hour * 730
-        
-        return 20.0  # Default fallback
+        price = _live_ec2_price(instance_type, region)
+        return price if price is not None else 20.0  # Default fallback
         
     except Exception as e:
         print(f"Error fetching EC2 pricing: {e}")
         return 20.0  # Default fallback
 
-def get_ebs_pricing(region: str = 'us-east-1') -> float:
-    """Get EBS pricing per GB from AWS Pricing API"""
+def get_ebs_pricing(region: str = 'us-east-1', volume_type: str = 'gp2') -> float:
+    """Get EBS pricing per GB from the price catalog or AWS Pricing API"""
+    catalog_price = PRICE_TABLE.get('ebs', {}).get(region, {}).get(volume_type)
+    if catalog_price is not None:
+        return catalog_price
+    
     try:
-        pricing_client = get_pricing_client()
-        
-        response = pricing_client.get_products(
-            ServiceCode='AmazonEC2',
-            Filters=[
-                {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'Storage'},
-                {'Type': 'TERM_MATCH', 'Field': 'volumeApiName', 'Value': 'gp2'},
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': get_region_name(region)}
-            ],
-            MaxResults=1
-        )
-        
-        if response['PriceList']:
-            import json
-            price_data = json.loads(response['PriceList'][0])
-            on_demand = price_data['terms']['OnDemand']
-            price_dimensions = list(on_demand.values())[0]['priceDimensions']
-            price_per_gb = float(list(price_dimensions.values())[0]['pricePerUnit']['USD'])
-            return price_per_gb
-        
-        return 0.10  # Default fallback
+        price = _live_ebs_price(region, volume_type)
+        return price if price is not None else 0.10  # Default fallback
         
     except Exception as e:
         print(f"Error fetching EBS pricing: {e}")
         return 0.10  # Default fallback
 
 def get_s3_pricing() -> float:
-    """Get S3 pricing per GB from AWS Pricing API"""
+    """Get S3 pricing per GB from the price catalog or AWS Pricing API"""
+    catalog_price = PRICE_TABLE.get('s3', {}).get('us-east-1')
+    if catalog_price is not None:
+        return catalog_price
+    
     try:
-        pricing_client = get_pricing_client()
-        
-        response = pricing_client.get_products(
-            ServiceCode='AmazonS3',
-            Filters=[
-                {'Type': 'TERM_MATCH', 'Field': 'productFamily', 'Value': 'Storage'},
-                {'Type': 'TERM_MATCH', 'Field': 'storageClass', 'Value': 'General Purpose'},
-                {'Type': 'TERM_MATCH', 'Field': 'location', 'Value': 'US East (N. Virginia)'}
-            ],
-            MaxResults=1
-        )
-        
-        if response['PriceList']:
-            import json
-            price_data = json.loads(response['PriceList'][0])
-            on_demand = price_data['terms']['OnDemand']
-            price_dimensions = list(on_demand.values())[0]['priceDimensions']
-            price_per_gb = float(list(price_dimensions.values())[0]['pricePerUnit']['USD'])
-            return price_per_gb
-        
-        return 0.023  # Default fallback
+        price = _live_s3_price()
+        return price if price is not None else 0.023  # Default fallback
         
     except Exception as e:
         print(f"Error fetching S3 pricing: {e}")
         return 0.023  # Default fallback
 
-def get_region_name(region_code: str) -> str:
-    """Convert region code to region name for Pricing API"""
-    region_names = {
-        'us-east-1': 'US East (N. Virginia)',
-        'us-east-2': 'US East (Ohio)',
-        'us-west-1': 'US West (N. California)',
-        'us-west-2': 'US West (Oregon)',
-        'eu-west-1': 'EU (Ireland)',
-        'eu-central-1': 'EU (Frankfurt)',
-        'ap-southeast-1': 'Asia Pacific (Singapore)',
-        'ap-northeast-1': 'Asia Pacific (Tokyo)',
-    }
-    return region_names.get(region_code, 'US East (N. Virginia)')
+@lru_cache(maxsize=1)
+def get_account_id() -> str:
+    """Get the AWS account ID for the configured credentials (looked up once)"""
+    return get_aws_client_factory().get_client('sts').get_caller_identity()['Account']
+
+def get_cached_costs_from_cost_explorer(days: int = 7) -> Dict:
+    """
+    Get daily costs from Cost Explorer, reusing results for an hour
+    
+    Cost Explorer data only updates a few times a day and each request is
+    billed, so results are shared across workers per (account, days).
+    
+    Args:
+        days: Number of days of history
+    
+    Returns:
+        Date to total cost mapping (empty if Cost Explorer is unavailable)
+    """
+    key = f"{CE_CACHE_PREFIX}{get_account_id()}:{days}"
+    daily_costs = get_shared(key)
+    if daily_costs is None:
+        daily_costs = get_actual_costs_from_cost_explorer(days=days)
+        set_shared(key, daily_costs, timedelta(hours=1))
+    return daily_costs
 
 def get_actual_costs_from_cost_explorer(days: int = 30) -> Dict:
     """Get actual costs from AWS Cost Explorer"""
@@ -172,7 +229,7 @@ def estimate_ec2_cost(instance: Dict, region: str = 'us-east-1') -> float:
 def estimate_ebs_cost(volume: Dict, region: str = 'us-east-1') -> float:
     """Estimate monthly cost for an EBS volume using AWS Pricing API"""
     size = volume.get('size', 0)
-    price_per_gb = get_ebs_pricing(region)
+    price_per_gb = get_ebs_pricing(region, volume.get('volume_type', 'gp2'))
     return size * price_per_gb
 
 def estimate_s3_cost(bucket: Dict) -> float:
@@ -182,20 +239,41 @@ def estimate_s3_cost(bucket: Dict) -> float:
     price_per_gb = get_s3_pricing()
     return size * price_per_gb
 
+async def prime_pricing_cache(region: str, ec2_instances: List[Dict], ebs_volumes: List[Dict]) -> None:
+    """Resolve each distinct instance/volume type price once, concurrently"""
+    instance_types = {instance.get('instance_type', 't2.micro') for instance in ec2_instances}
+    volume_types = {volume.get('volume_type', 'gp2') for volume in ebs_volumes}
+    
+    await asyncio.gather(
+        *[asyncio.to_thread(get_ec2_pricing, instance_type, region) for instance_type in instance_types],
+        *[asyncio.to_thread(get_ebs_pricing, region, volume_type) for volume_type in volume_types]
+    )
+
 def calculate_resource_costs(resource_type: str, resources: List[Dict], region: str = 'us-east-1') -> Dict:
     """Calculate costs for a specific resource type"""
     total_cost = 0.0
     resource_count = len(resources)
     
+    # Aggregate per price key first so each price is looked up once, then sum
+    # count/size x price over the (few) distinct keys
     if resource_type == 'ec2':
-        for resource in resources:
-            total_cost += estimate_ec2_cost(resource, region)
+        type_counts = Counter(resource.get('instance_type', 't2.micro') for resource in resources)
+        total_cost = math.fsum(
+            get_ec2_pricing(instance_type, region) * count
+            for instance_type, count in type_counts.items()
+        )
     elif resource_type == 'ebs':
+        gb_by_type = defaultdict(int)
         for resource in resources:
-            total_cost += estimate_ebs_cost(resource, region)
+            gb_by_type[resource.get('volume_type', 'gp2')] += resource.get('size', 0)
+        total_cost = math.fsum(
+            get_ebs_pricing(region, volume_type) * size
+            for volume_type, size in gb_by_type.items()
+        )
     elif resource_type == 's3':
-        for resource in resources:
-            total_cost += estimate_s3_cost(resource)
+        # Simplified: assume 10GB average for unused buckets
+        total_gb = sum(resource.get('size_gb', 10) for resource in resources)
+        total_cost = total_gb * get_s3_pricing() if total_gb else 0.0
     # IAM resources are free
     
     estimated_monthly = total_cost / resource_count if resource_count > 0 else 0.0
@@ -208,134 +286,174 @@ def calculate_resource_costs(resource_type: str, resources: List[Dict], region:
         'resourceCount': resource_count
     }
 
-@router.get("/cost-analysis")
-async def get_cost_analysis(region: str = 'us-east-1'):
-    """Get comprehensive cost analysis for all resources"""
+# Server-side filters plus JMESPath projections keep only the fields costing
+# needs, instead of materializing full resource descriptions
+STOPPED_INSTANCES_EXPRESSION = jmespath.compile(
+    "Reservations[].Instances[].{id: InstanceId, instance_type: InstanceType || 't2.micro', state: 'stopped', "
+    "state_reason: StateTransitionReason}"
+)
+AVAILABLE_VOLUMES_QUERY = (
+    "Volumes[].{id: VolumeId, size: Size || `0`, volume_type: VolumeType || 'gp2', state: 'available'}"
+)
+
+def fetch_stopped_instances(ec2_client) -> List[Dict]:
+    """Get EC2 instances stopped by a user more than a week ago"""
+    return fetch_unused_instances(ec2_client, STOPPED_INSTANCES_EXPRESSION)
+
+def fetch_available_volumes(ec2_client) -> List[Dict]:
+    """Get EBS volumes not attached to any instance"""
+    paginator = ec2_client.get_paginator('describe_volumes')
+    pages = paginator.paginate(
+        Filters=[{'Name': 'status', 'Values': ['available']}],
+        PaginationConfig={'PageSize': 500}  # DescribeVolumes maximum
+    )
+    return list(pages.search(AVAILABLE_VOLUMES_QUERY))
+
+def fetch_buckets(s3_client) -> List[Dict]:
+    """Get S3 buckets (simplified - just count)"""
     try:
-        # Check cache first
-        cache = get_cache()
-        cache_key = f'cost_analysis_{region}'
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
-        
-        aws_client = get_aws_client_factory()
-        
-        # Fetch all resource data directly using AWS clients
-        factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=region)
-        s3_client = factory.session.client('s3')
-        iam_client = factory.session.client('iam')
-        
-        # Get EC2 instances
-        ec2_response = ec2_client.describe_instances(
-            Filters=[{'Name': 'instance-state-name', 'Values': ['stopped']}]
-        )
-        ec2_instances = []
-        for reservation in ec2_response.get('Reservations', []):
-            for instance in reservation.get('Instances', []):
-                if 'User initiated' in instance.get('StateTransitionReason', ''):
-                    ec2_instances.append({
-                        'id': instance.get('InstanceId'),
-                        'instance_type': instance.get('InstanceType', 't2.micro'),
-                        'state': 'stopped'
-                    })
-        
-        # Get EBS volumes
-        ebs_response = ec2_client.describe_volumes(
-            Filters=[{'Name': 'status', 'Values': ['available']}]
-        )
-        ebs_volumes = []
-        for volume in ebs_response.get('Volumes', []):
-            ebs_volumes.append({
-                'id': volume.get('VolumeId'),
-                'size': volume.get('Size', 0),
-                'state': 'available'
-            })
-        
-        # Get S3 buckets (simplified - just count)
-        try:
-            s3_response = s3_client.list_buckets()
-            s3_buckets = [{'name': bucket['Name'], 'size_gb': 10} for bucket in s3_response.get('Buckets', [])]
-        except:
-            s3_buckets = []
-        
-        # Get IAM roles (simplified)
-        try:
-            iam_paginator = iam_client.get_paginator('list_roles')
-            iam_roles = []
-            for page in iam_paginator.paginate():
-                iam_roles.extend(page.get('Roles', []))
-        except:
-            iam_roles = []
-        
-        # Get IAM users (simplified)
-        try:
-            user_paginator = iam_client.get_paginator('list_users')
-            iam_users = []
-            for page in user_paginator.paginate():
-                iam_users.extend(page.get('Users', []))
-        except:
-            iam_users = []
-        
-        # Access keys count (simplified)
-        access_keys = []
-        
-        ec2_data = {'unused_instances': ec2_instances}
-        ebs_data = {'unused_volumes': ebs_volumes}
-        s3_data = {'unused_buckets': s3_buckets}
-        iam_data = {'unused_roles': iam_roles}
-        iam_users_data = {'unused_users': iam_users}
-        access_keys_data = {'unused_keys': access_keys}
-        
-        # Calculate costs for each resource type
-        estimates = []
-        total_cost = 0.0
-        total_resources = 0
-        
-        for resource_type, data_key, data in [
-            ('ec2', 'unused_instances', ec2_data),
-            ('ebs', 'unused_volumes', ebs_data),
-            ('s3', 'unused_buckets', s3_data),
-            ('iam', 'unused_roles', iam_data),
-            ('iam_users', 'unused_users', iam_users_data),
-            ('access_keys', 'unused_keys', access_keys_data)
-        ]:
-            resources = data.get(data_key, [])
-            cost_info = calculate_resource_costs(resource_type, resources, region)
-            estimates.append(cost_info)
-            total_cost += cost_info['currentCost']
-            total_resources += cost_info['resourceCount']
+        s3_response = s3_client.list_buckets()
+        return [{'name': bucket['Name'], 'size_gb': 10} for bucket in s3_response.get('Buckets', [])]
+    except:
+        return []
+
+def fetch_iam_roles(iam_client) -> List[Dict]:
+    """Get all IAM roles (simplified - names only, roles are only counted)"""
+    try:
+        iam_paginator = iam_client.get_paginator('list_roles')
+        pages = iam_paginator.paginate(PaginationConfig={'PageSize': 1000})
+        return list(pages.search('Roles[].{name: RoleName}'))
+    except:
+        return []
+
+def fetch_iam_users(iam_client) -> List[Dict]:
+    """Get all IAM users (simplified - names only, users are only counted)"""
+    try:
+        user_paginator = iam_client.get_paginator('list_users')
+        pages = user_paginator.paginate(PaginationConfig={'PageSize': 1000})
+        return list(pages.search('Users[].{name: UserName}'))
+    except:
+        return []
+
+def cost_cache_key(region: str) -> str:
+    """Shared Redis key for a region's cost analysis"""
+    return f"{COST_CACHE_PREFIX}{region}"
+
+def read_cost_analysis(region: str) -> Optional[Dict]:
+    """
+    Get a region's cached analysis and note that it was requested
+    
+    The read marker expires after COST_ANALYSIS_CACHE_TTL, so the warm task
+    only rebuilds regions someone asked for recently.
+    
+    Args:
+        region: AWS region
+    
+    Returns:
+        Cache entry, or None on a miss
+    """
+    try:
+        get_redis_client().setex(f"{COST_READ_PREFIX}{region}", settings.cost_analysis_cache_ttl, 1)
+    except Exception as e:
+        print(f"Could not record cost analysis read for {region}: {e}")
+    return get_shared(cost_cache_key(region))
+
+def store_cost_analysis(region: str, result: Dict) -> None:
+    """Store a cost analysis in the shared cache, stamped with its build time"""
+    ttl = settings.cost_analysis_cache_ttl
+    # Kept past its refresh age so stale entries can still be served
+    set_shared(
+        cost_cache_key(region),
+        {'generated_at': time.time(), 'data': result},
+        timedelta(seconds=ttl * 2)
+    )
+
+async def build_cost_analysis(region: str = 'us-east-1') -> Dict:
+    """
+    Build a cost analysis from live AWS data (no caching)
+    
+    Args:
+        region: AWS region to analyze
+        
+    Returns:
+        Cost analysis payload as served by /cost-analysis
+    """
+    # Pick up a catalog the weekly refresh published since the last build
+    await asyncio.to_thread(sync_price_table)
+    
+    # Fetch all resource data directly using AWS clients
+    factory = get_aws_client_factory()
+    ec2_client = factory.get_client('ec2', region)
+    s3_client = factory.get_client('s3')
+    iam_client = factory.get_client('iam')
+    
+    # Discovery calls are independent, so run them side by side in worker threads
+    ec2_instances, ebs_volumes, s3_buckets, iam_roles, iam_users = await asyncio.gather(
+        asyncio.to_thread(fetch_stopped_instances, ec2_client),
+        asyncio.to_thread(fetch_available_volumes, ec2_client),
+        asyncio.to_thread(fetch_buckets, s3_client),
+        asyncio.to_thread(fetch_iam_roles, iam_client),
+        asyncio.to_thread(fetch_iam_users, iam_client)
+    )
+    
+    # Access keys count (simplified)
+    access_keys = []
+    
+    ec2_data = {'unused_instances': ec2_instances}
+    ebs_data = {'unused_volumes': ebs_volumes}
+    s3_data = {'unused_buckets': s3_buckets}
+    iam_data = {'unused_roles': iam_roles}
+    iam_users_data = {'unused_users': iam_users}
+    access_keys_data = {'unused_keys': access_keys}
+    
+    # Look up each distinct price once before summing per resource
+    await prime_pricing_cache(region, ec2_instances, ebs_volumes)
+    
+    # Calculate costs for each resource type
+    estimates = []
+    total_cost = 0.0
+    total_resources = 0
+    
+    for resource_type, data_key, data in [
+        ('ec2', 'unused_instances', ec2_data),
+        ('ebs', 'unused_volumes', ebs_data),
+        ('s3', 'unused_buckets', s3_data),
+        ('iam', 'unused_roles', iam_data),
+        ('iam_users', 'unused_users', iam_users_data),
+        ('access_keys', 'unused_keys', access_keys_data)
+    ]:
+        resources = data.get(data_key, [])
+        cost_info = calculate_resource_costs(resource_type, resources, region)
+        estimates.append(cost_info)
+        total_cost += cost_info['currentCost']
+        total_resources += cost_info['resourceCount']
+    
+    # Nothing unused: skip the Cost Explorer call and trend estimation
+    if total_resources == 0:
+        return {
+            'estimates': estimates,
+            'trends': [],
+            'totalCurrentCost': 0.0,
+            'totalPotentialSavings': 0.0,
+            'totalResources': 0
+        }
+    
+    # Try to get actual cost trends from Cost Explorer
+    try:
+        # Blocking HTTPS call; keep it off the event loop like the discovery calls
+        daily_costs = await asyncio.to_thread(get_cached_costs_from_cost_explorer, 7)
+        trends = []
         
-        # Try to get actual cost trends from Cost Explorer
-        try:
-            daily_costs = get_actual_costs_from_cost_explorer(days=7)
-            trends = []
-            
-            if daily_costs:
-                for date, cost in sorted(daily_costs.items()):
-                    trends.append({
-                        'date': date,
-                        'totalCost': round(cost, 2),
-                        'savings': round(total_cost * 0.1, 2),  # Estimated savings
-                        'resourceCount': total_resources
-                    })
-            else:
-                # Fallback to estimated trends
-                for i in range(7):
-                    date = datetime.now() - timedelta(days=6-i)
-                    daily_cost = total_cost * (1.0 - (i * 0.05))
-                    daily_savings = total_cost - daily_cost
-                    trends.append({
-                        'date': date.isoformat(),
-                        'totalCost': round(daily_cost, 2),
-                        'savings': round(daily_savings, 2),
-                        'resourceCount': max(1, total_resources - i)
-                    })
-        except Exception as e:
-            print(f"Error fetching Cost Explorer data: {e}")
+        if daily_costs:
+            for date, cost in sorted(daily_costs.items()):
+                trends.append({
+                    'date': date,
+                    'totalCost': round(cost, 2),
+                    'savings': round(total_cost * 0.1, 2),  # Estimated savings
+                    'resourceCount': total_resources
+                })
+        else:
             # Fallback to estimated trends
-            trends = []
             for i in range(7):
                 date = datetime.now() - timedelta(days=6-i)
                 daily_cost = total_cost * (1.0 - (i * 0.05))
@@ -346,154 +464,273 @@ async def get_cost_analysis(region: str = 'us-east-1'):
                     'savings': round(daily_savings, 2),
                     'resourceCount': max(1, total_resources - i)
                 })
-        
-        result = {
-            'estimates': estimates,
-            'trends': trends,
-            'totalCurrentCost': round(total_cost, 2),
-            'totalPotentialSavings': round(total_cost, 2),
-            'totalResources': total_resources
-        }
-        
-        # Cache for 1 hour
-        from datetime import timedelta
-        cache.set(cache_key, result, ttl=timedelta(hours=1))
-        
+    except Exception as e:
+        print(f"Error fetching Cost Explorer data: {e}")
+        # Fallback to estimated trends
+        trends = []
+        for i in range(7):
+            date = datetime.now() - timedelta(days=6-i)
+            daily_cost = total_cost * (1.0 - (i * 0.05))
+            daily_savings = total_cost - daily_cost
+            trends.append({
+                'date': date.isoformat(),
+                'totalCost': round(daily_cost, 2),
+                'savings': round(daily_savings, 2),
+                'resourceCount': max(1, total_resources - i)
+            })
+    
+    return {
+        'estimates': estimates,
+        'trends': trends,
+        'totalCurrentCost': round(total_cost, 2),
+        'totalPotentialSavings': round(total_cost, 2),
+        'totalResources': total_resources
+    }
+
+async def _refresh_cost_analysis(region: str) -> Dict:
+    """Rebuild and store a region's analysis, one build per region at a time"""
+    async with _cost_locks[region]:
+        result = await build_cost_analysis(region)
+        await asyncio.to_thread(store_cost_analysis, region, result)
         return result
+
+async def _revalidate_cost_analysis(region: str) -> None:
+    """Background refresh for a stale entry"""
+    try:
+        await _refresh_cost_analysis(region)
+    except Exception as e:
+        print(f"Error refreshing cost analysis for {region}: {e}")
+    finally:
+        _revalidating.pop(region, None)
+
+@router.get("/cost-analysis")
+async def get_cost_analysis(region: str = 'us-east-1'):
+    """Get comprehensive cost analysis for all resources"""
+    try:
+        # Shared across API workers; stale entries are served while a
+        # background refresh rebuilds them. Redis calls run in a worker thread
+        # so a slow Redis cannot stall the event loop
+        entry = await asyncio.to_thread(read_cost_analysis, region)
+        if entry:
+            age = time.time() - entry['generated_at']
+            if age > settings.cost_analysis_cache_ttl and region not in _revalidating:
+                _revalidating[region] = asyncio.create_task(_revalidate_cost_analysis(region))
+            return entry['data']
+        
+        async with _cost_locks[region]:
+            # Another request may have built it while we waited
+            entry = await asyncio.to_thread(get_shared, cost_cache_key(region))
+            if entry:
+                return entry['data']
+            
+            result = await build_cost_analysis(region)
+            await asyncio.to_thread(store_cost_analysis, region, result)
+            return result
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate cost analysis: {str(e)}")
 
+# Report styles are immutable once built, so create them once per process
+if REPORTLAB_AVAILABLE:
+    _STYLES = getSampleStyleSheet()
+    _META_STYLE = _STYLES['Normal']
+    _TITLE_STYLE = ParagraphStyle(
+        'CustomTitle',
+        parent=_STYLES['Heading1'],
+        fontSize=24,
+        textColor=colors.HexColor('#1e40af'),
+        spaceAfter=30,
+        alignment=1  # Center
+    )
+    _SUMMARY_STYLE = ParagraphStyle(
+        'SummaryTitle',
+        parent=_STYLES['Heading2'],
+        fontSize=16,
+        textColor=colors.HexColor('#059669'),
+        spaceAfter=12
+    )
+    _FOOTER_STYLE = ParagraphStyle(
+        'Footer',
+        parent=_STYLES['Normal'],
+        fontSize=9,
+        textColor=colors.grey,
+        alignment=1
+    )
+    _SUMMARY_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3b82f6')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 12),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
+    ])
+    _BREAKDOWN_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10b981')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, 0), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+        ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
+    ])
+
+def build_cost_pdf(cost_data: Dict, region: str) -> bytes:
+    """
+    Render a cost analysis as a PDF report (CPU-bound, keep off the event loop)
+    
+    Args:
+        cost_data: Cost analysis payload from /cost-analysis
+        region: Region shown in the report header
+    
+    Returns:
+        PDF document bytes
+    """
+    # Create PDF buffer
+    buffer = io.BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=letter)
+    elements = []
+    
+    # Title
+    elements.append(Paragraph("Cloud Cleaner - Cost Analysis Report", _TITLE_STYLE))
+    elements.append(Spacer(1, 0.2*inch))
+    
+    # Metadata
+    elements.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", _META_STYLE))
+    elements.append(Paragraph(f"<b>Region:</b> {region}", _META_STYLE))
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Summary Section
+    elements.append(Paragraph("Summary", _SUMMARY_STYLE))
+    
+    summary_data = [
+        ['Metric', 'Value'],
+        ['Total Current Cost', f"${cost_data['totalCurrentCost']:.2f}/month"],
+        ['Potential Savings', f"${cost_data['totalPotentialSavings']:.2f}/month"],
+        ['Savings Percentage', f"{(cost_data['totalPotentialSavings']/cost_data['totalCurrentCost']*100) if cost_data['totalCurrentCost'] > 0 else 0:.1f}%"],
+        ['Total Unused Resources', str(cost_data['totalResources'])]
+    ]
+    
+    summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
+    summary_table.setStyle(_SUMMARY_TABLE_STYLE)
+    elements.append(summary_table)
+    elements.append(Spacer(1, 0.4*inch))
+    
+    # Cost Breakdown Section
+    elements.append(Paragraph("Cost Breakdown by Resource Type", _SUMMARY_STYLE))
+    
+    breakdown_data = [['Resource Type', 'Count', 'Monthly Cost', 'Potential Savings', 'Avg/Resource']]
+    for estimate in cost_data['estimates']:
+        if estimate['resourceCount'] > 0:  # Only show resources that exist
+            breakdown_data.append([
+                estimate['resourceType'].upper(),
+                str(estimate['resourceCount']),
+                f"${estimate['currentCost']:.2f}",
+                f"${estimate['potentialSavings']:.2f}",
+                f"${estimate['estimatedMonthly']:.2f}"
+            ])
+    
+    breakdown_table = Table(breakdown_data, colWidths=[1.5*inch, 0.8*inch, 1.2*inch, 1.3*inch, 1.2*inch])
+    breakdown_table.setStyle(_BREAKDOWN_TABLE_STYLE)
+    elements.append(breakdown_table)
+    elements.append(Spacer(1, 0.3*inch))
+    
+    # Footer
+    elements.append(Spacer(1, 0.5*inch))
+    elements.append(Paragraph("Generated by Cloud Cleaner", _FOOTER_STYLE))
+    
+    # Build PDF
+    doc.build(elements)
+    return buffer.getvalue()
+
+def pdf_response(pdf_bytes: bytes) -> StreamingResponse:
+    """Wrap PDF bytes in a download response"""
+    return StreamingResponse(
+        io.BytesIO(pdf_bytes),
+        media_type="application/pdf",
+        headers={
+            "Content-Disposition": f"attachment; filename=cost-analysis-{datetime.now().strftime('%Y%m%d')}.pdf"
+        }
+    )
+
+def require_reportlab() -> None:
+    """Raise a 500 if PDF export is unavailable"""
+    if not REPORTLAB_AVAILABLE:
+        # Fallback if reportlab is not installed
+        raise HTTPException(
+            status_code=500,
+            detail="reportlab library not installed. Install with: pip install reportlab"
+        )
+
 @router.post("/cost-analysis/export/pdf")
 async def export_cost_analysis_pdf(region: str = 'us-east-1'):
     """Export cost analysis as PDF using reportlab"""
+    require_reportlab()
+    
     try:
-        from reportlab.lib.pagesizes import letter, A4
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.units import inch
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
-        from reportlab.lib import colors
-        
         # Get cost analysis data
         cost_data = await get_cost_analysis(region=region)
         
-        # Create PDF buffer
-        buffer = io.BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=letter)
-        elements = []
-        styles = getSampleStyleSheet()
-        
-        # Title
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=24,
-            textColor=colors.HexColor('#1e40af'),
-            spaceAfter=30,
-            alignment=1  # Center
-        )
-        elements.append(Paragraph("Cloud Cleaner - Cost Analysis Report", title_style))
-        elements.append(Spacer(1, 0.2*inch))
-        
-        # Metadata
-        meta_style = styles['Normal']
-        elements.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}", meta_style))
-        elements.append(Paragraph(f"<b>Region:</b> {region}", meta_style))
-        elements.append(Spacer(1, 0.3*inch))
-        
-        # Summary Section
-        summary_style = ParagraphStyle(
-            'SummaryTitle',
-            parent=styles['Heading2'],
-            fontSize=16,
-            textColor=colors.HexColor('#059669'),
-            spaceAfter=12
-        )
-        elements.append(Paragraph("Summary", summary_style))
-        
-        summary_data = [
-            ['Metric', 'Value'],
-            ['Total Current Cost', f"${cost_data['totalCurrentCost']:.2f}/month"],
-            ['Potential Savings', f"${cost_data['totalPotentialSavings']:.2f}/month"],
-            ['Savings Percentage', f"{(cost_data['totalPotentialSavings']/cost_data['totalCurrentCost']*100) if cost_data['totalCurrentCost'] > 0 else 0:.1f}%"],
-            ['Total Unused Resources', str(cost_data['totalResources'])]
-        ]
+        # Render in a worker thread so the event loop keeps serving requests
+        pdf_bytes = await asyncio.to_thread(build_cost_pdf, cost_data, region)
         
-        summary_table = Table(summary_data, colWidths=[3*inch, 2*inch])
-        summary_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3b82f6')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 12),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('FONTNAME', (0, 1), (0, -1), 'Helvetica-Bold'),
-        ]))
-        elements.append(summary_table)
-        elements.append(Spacer(1, 0.4*inch))
+        return pdf_response(pdf_bytes)
         
-        # Cost Breakdown Section
-        elements.append(Paragraph("Cost Breakdown by Resource Type", summary_style))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to export PDF: {str(e)}")
+
+@router.post("/cost-analysis/export/pdf/async")
+async def export_cost_analysis_pdf_async(region: str = 'us-east-1'):
+    """Queue PDF generation on a Celery worker (poll /cost-analysis/export/pdf/{task_id})"""
+    require_reportlab()
+    
+    try:
+        from core.tasks import render_cost_pdf_task
         
-        breakdown_data = [['Resource Type', 'Count', 'Monthly Cost', 'Potential Savings', 'Avg/Resource']]
-        for estimate in cost_data['estimates']:
-            if estimate['resourceCount'] > 0:  # Only show resources that exist
-                breakdown_data.append([
-                    estimate['resourceType'].upper(),
-                    str(estimate['resourceCount']),
-                    f"${estimate['currentCost']:.2f}",
-                    f"${estimate['potentialSavings']:.2f}",
-                    f"${estimate['estimatedMonthly']:.2f}"
-                ])
+        task = render_cost_pdf_task.delay(region)
+        return {
+            "task_id": task.id,
+            "status": "queued",
+            "message": f"PDF export queued for {region}"
+        }
         
-        breakdown_table = Table(breakdown_data, colWidths=[1.5*inch, 0.8*inch, 1.2*inch, 1.3*inch, 1.2*inch])
-        breakdown_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#10b981')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.lightgrey),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.lightgrey]),
-        ]))
-        elements.append(breakdown_table)
-        elements.append(Spacer(1, 0.3*inch))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to queue PDF export: {str(e)}")
+
+@router.get("/cost-analysis/export/pdf/{task_id}")
+async def get_cost_analysis_pdf(task_id: str):
+    """Download a PDF queued with /cost-analysis/export/pdf/async, or report its status"""
+    try:
+        state = await asyncio.to_thread(lambda: AsyncResult(task_id, app=celery_app).state)
         
-        # Footer
-        footer_style = ParagraphStyle(
-            'Footer',
-            parent=styles['Normal'],
-            fontSize=9,
-            textColor=colors.grey,
-            alignment=1
-        )
-        elements.append(Spacer(1, 0.5*inch))
-        elements.append(Paragraph("Generated by Cloud Cleaner", footer_style))
+        if state == states.FAILURE:
+            raise HTTPException(status_code=500, detail=f"PDF export {task_id} failed")
+        if state != states.SUCCESS:
+            return JSONResponse(status_code=202, content={"task_id": task_id, "status": state})
         
-        # Build PDF
-        doc.build(elements)
-        buffer.seek(0)
+        pdf_bytes = await asyncio.to_thread(get_redis_client().get, f"{PDF_CACHE_PREFIX}{task_id}")
+        if pdf_bytes is None:
+            raise HTTPException(status_code=404, detail=f"PDF export {task_id} has expired")
         
-        return StreamingResponse(
-            buffer,
-            media_type="application/pdf",
-            headers={
-                "Content-Disposition": f"attachment; filename=cost-analysis-{datetime.now().strftime('%Y%m%d')}.pdf"
-            }
-        )
+        return pdf_response(pdf_bytes)
         
-    except ImportError:
-        # Fallback if reportlab is not installed
-        raise HTTPException(
-            status_code=500,
-            detail="reportlab library not installed. Install with: pip install reportlab"
-        )
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to export PDF: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch PDF export: {str(e)}")
+
+def iter_cost_csv(cost_data: Dict):
+    """Yield the cost analysis CSV one row at a time"""
+    yield "Resource Type,Resource Count,Monthly Cost,Potential Savings,Avg Cost Per Resource\n"
+    
+    for estimate in cost_data['estimates']:
+        yield f"{estimate['resourceType']},{estimate['resourceCount']},${estimate['currentCost']:.2f},${estimate['potentialSavings']:.2f},${estimate['estimatedMonthly']:.2f}\n"
+    
+    yield f"\nTotal,{cost_data['totalResources']},${cost_data['totalCurrentCost']:.2f},${cost_data['totalPotentialSavings']:.2f},-\n"
 
 @router.get("/cost-analysis/export/csv")
 async def export_cost_analysis_csv(region: str = 'us-east-1'):
@@ -502,19 +739,8 @@ async def export_cost_analysis_csv(region: str = 'us-east-1'):
         # Get cost analysis data
         cost_data = await get_cost_analysis(region=region)
         
-        # Generate CSV content
-        csv_content = "Resource Type,Resource Count,Monthly Cost,Potential Savings,Avg Cost Per Resource\n"
-        
-        for estimate in cost_data['estimates']:
-            csv_content += f"{estimate['resourceType']},{estimate['resourceCount']},${estimate['currentCost']:.2f},${estimate['potentialSavings']:.2f},${estimate['estimatedMonthly']:.2f}\n"
-        
-        csv_content += f"\nTotal,{cost_data['totalResources']},${cost_data['totalCurrentCost']:.2f},${cost_data['totalPotentialSavings']:.2f},-\n"
-        
-        # Create CSV response
-        buffer = io.BytesIO(csv_content.encode('utf-8'))
-        
         return StreamingResponse(
-            buffer,
+            iter_cost_csv(cost_data),
             media_type="text/csv",
             headers={
                 "Content-Disposition": f"attachment; filename=cost-analysis-{datetime.now().strftime('%Y%m%d')}.csv"
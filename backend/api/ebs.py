@@ -1,65 +1,227 @@
 from fastapi import APIRouter, HTTPException, Query
-from typing import List, Dict, Any, Optional, Union
-from core.aws_client import get_aws_client_factory
+from fastapi.responses import StreamingResponse
+from botocore.exceptions import ClientError
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional, Tuple
+from core.aws_client import NAME_TAG_PROJECTION, get_aws_client_factory, search_pages
 from core.cache import cached, invalidate_cache
+from core.ec2_batcher import get_volume_batcher
 from core.config import settings
+import asyncio
+import jmespath
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Cap concurrent regional scans to stay within EC2 API throttling limits
+REGION_SCAN_LIMIT = asyncio.Semaphore(8)
+
+# JMESPath projections compiled once and evaluated on each page, so the Name
+# tag lookup and field selection never run as Python loops in the handlers
+UNUSED_VOLUMES_EXPRESSION = jmespath.compile(
+    "Volumes[].{id: VolumeId, name: " + NAME_TAG_PROJECTION + ", "
+    "size: Size || `0`, type: VolumeType || 'unknown', state: State || 'unknown', "
+    "create_time: CreateTime}"
+)
+ALL_VOLUMES_EXPRESSION = jmespath.compile(
+    "Volumes[].{id: VolumeId, name: " + NAME_TAG_PROJECTION + ", "
+    "size: Size || `0`, type: VolumeType || 'unknown', state: State || 'unknown', "
+    "attached_to: Attachments[0].InstanceId}"
+)
+
+
+async def _scan_region(region: str, expression: jmespath.parser.ParsedResult, filters: Optional[List[Dict[str, Any]]] = None) -> List[Dict[str, Any]]:
+    """
+    Fetch every EBS volume page in a region, projected with JMESPath
+    
+    Args:
+        region: AWS region to scan
+        expression: Compiled JMESPath projection applied to each describe_volumes page
+        filters: Optional describe_volumes filters
+    
+    Returns:
+        List of projected volume dictionaries tagged with their region
+    """
+    ec2_client = get_aws_client_factory().get_client('ec2', region)
+    paginator = ec2_client.get_paginator('describe_volumes')
+    kwargs = {'PaginationConfig': {'PageSize': 500}}
+    if filters:
+        kwargs['Filters'] = filters
+    
+    async with REGION_SCAN_LIMIT:
+        volumes = await asyncio.to_thread(search_pages, paginator.paginate(**kwargs), expression)
+    for volume in volumes:
+        volume['region'] = region
+    return volumes
+
+
+async def _scan_regions(regions: List[str], expression: jmespath.parser.ParsedResult, filters: Optional[List[Dict[str, Any]]] = None) -> Tuple[List[Dict[str, Any]], Dict[str, str]]:
+    """
+    Scan several regions concurrently
+    
+    Args:
+        regions: AWS regions to scan
+        expression: Compiled JMESPath projection applied to each describe_volumes page
+        filters: Optional describe_volumes filters
+    
+    Returns:
+        Tuple of projected volumes and a mapping of failed regions to errors
+    
+    Raises:
+        Exception: The first region error if every region failed
+    """
+    results = await asyncio.gather(*(_scan_region(r, expression, filters) for r in regions), return_exceptions=True)
+    
+    volumes = []
+    failed_regions = {}
+    for scanned_region, result in zip(regions, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error scanning EBS volumes in region {scanned_region}: {str(result)}")
+            failed_regions[scanned_region] = str(result)
+        else:
+            volumes.extend(result)
+    
+    if len(failed_regions) == len(regions):
+        raise next(r for r in results if isinstance(r, Exception))
+    return volumes, failed_regions
+
+
+async def _next_page(pages: Iterator[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Fetch the next describe_volumes page in a worker thread, or None when exhausted"""
+    async with REGION_SCAN_LIMIT:
+        return await asyncio.to_thread(next, pages, None)
+
+
+async def _open_region_pages(region: str) -> Tuple[Iterator[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Start paging through every EBS volume in a region
+    
+    Args:
+        region: AWS region to scan
+    
+    Returns:
+        Tuple of the page iterator and its first page
+    """
+    paginator = get_aws_client_factory().get_client('ec2', region).get_paginator('describe_volumes')
+    pages = iter(paginator.paginate(PaginationConfig={'PageSize': 500}))
+    return pages, await _next_page(pages)
+
+
+async def _produce_volume_pages(
+    region: str,
+    pages: Iterator[Dict[str, Any]],
+    page: Optional[Dict[str, Any]],
+    queue: asyncio.Queue,
+    failed_regions: Dict[str, str]
+) -> None:
+    """
+    Queue the projected volumes of each remaining page in a region, then None
+    
+    Args:
+        region: AWS region being scanned
+        pages: describe_volumes page iterator for the region
+        page: First page, already fetched
+        queue: Queue consumed by the response stream
+        failed_regions: Mapping to record a mid-scan failure in
+    """
+    try:
+        while page is not None:
+            volumes = ALL_VOLUMES_EXPRESSION.search(page) or []
+            for volume in volumes:
+                volume['region'] = region
+            await queue.put(volumes)
+            page = await _next_page(pages)
+    except Exception as e:
+        logger.error(f"Error scanning EBS volumes in region {region}: {str(e)}")
+        failed_regions[region] = str(e)
+    finally:
+        await queue.put(None)
+
+
+async def _stream_all_volumes(
+    target_regions: List[str],
+    started: Dict[str, Tuple[Iterator[Dict[str, Any]], Dict[str, Any]]],
+    failed_regions: Dict[str, str]
+) -> AsyncIterator[bytes]:
+    """
+    Stream the /all response body page by page as regions are scanned
+    
+    Only about one page per region is held in memory at a time, however
+    many volumes the account has. failed_regions is written last, so it
+    also reports regions that failed part way through.
+    
+    Args:
+        target_regions: Regions requested
+        started: Page iterator and first page of every region that responded
+        failed_regions: Regions that already failed to respond
+    
+    Yields:
+        Chunks of the JSON response body
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=len(started))
+    producers = [
+        asyncio.create_task(_produce_volume_pages(r, pages, page, queue, failed_regions))
+        for r, (pages, page) in started.items()
+    ]
+    
+    try:
+        yield b'{"region":' + orjson.dumps(target_regions[0]) + b',"regions":' + orjson.dumps(target_regions) + b',"volumes":['
+        
+        total = 0
+        separator = b''
+        remaining = len(producers)
+        while remaining:
+            volumes = await queue.get()
+            if volumes is None:
+                remaining -= 1
+            elif volumes:
+                total += len(volumes)
+                yield separator + b','.join(map(orjson.dumps, volumes))
+                separator = b','
+        
+        yield b'],"failed_regions":' + orjson.dumps(failed_regions) + b'}'
+        logger.info(f"Streamed {total} total EBS volumes in regions {', '.join(target_regions)}")
+    finally:
+        for producer in producers:
+            producer.cancel()
+
 
 @router.get("/unused")
 @cached(ttl_minutes=5, key_prefix="ebs")
-async def get_unused_ebs(region: Optional[str] = Query(None)) -> Dict[str, Union[List[Dict[str, Any]], str]]:
+async def get_unused_ebs(
+    region: Optional[str] = Query(None),
+    regions: Optional[List[str]] = Query(None)
+) -> Dict[str, Any]:
     """
     Get list of unattached EBS volumes (potential cleanup candidates)
     
     Args:
         region: AWS region to scan (optional, defaults to configured region)
+        regions: AWS regions to scan concurrently (optional, overrides region)
     
     Returns:
         Dictionary containing list of unused EBS volumes
     """
     try:
-        # Use provided region or default from settings
+        # Use provided regions, region or default from settings
         target_region = region or settings.aws_region
+        target_regions = regions or [target_region]
         
-        # Get EC2 client for specific region (EBS uses EC2 client)
-        factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=target_region)
-        
-        # Get all volumes
-        response = ec2_client.describe_volumes(
-            Filters=[{'Name': 'status', 'Values': ['available']}]
+        # Get all available volumes, across every page of every region
+        unused_volumes, failed_regions = await _scan_regions(
+            target_regions,
+            UNUSED_VOLUMES_EXPRESSION,
+            [{'Name': 'status', 'Values': ['available']}]
         )
         
-        unused_volumes = []
-        for volume in response.get('Volumes', []):
-            volume_id = volume.get('VolumeId')
-            size = volume.get('Size', 0)
-            volume_type = volume.get('VolumeType', 'unknown')
-            create_time = volume.get('CreateTime')
-            state = volume.get('State', 'unknown')
-            
-            # Get volume name from tags
-            volume_name = 'N/A'
-            for tag in volume.get('Tags', []):
-                if tag.get('Key') == 'Name':
-                    volume_name = tag.get('Value', 'N/A')
-                    break
-            
-            unused_volumes.append({
-                "id": volume_id,
-                "name": volume_name,
-                "size": size,
-                "type": volume_type,
-                "state": state,
-                "create_time": create_time.isoformat() if create_time else None
-            })
-        
-        logger.info(f"Found {len(unused_volumes)} unused EBS volumes in region {target_region}")
-        return {"unused_volumes": unused_volumes, "region": target_region}
+        logger.info(f"Found {len(unused_volumes)} unused EBS volumes in regions {', '.join(target_regions)}")
+        return {
+            "unused_volumes": unused_volumes,
+            "region": target_regions[0],
+            "regions": target_regions,
+            "failed_regions": failed_regions
+        }
         
     except Exception as e:
         logger.error(f"Error fetching unused EBS volumes: {str(e)}")
@@ -70,55 +232,45 @@ async def get_unused_ebs(region: Optional[str] = Query(None)) -> Dict[str, Union
 
 
 @router.get("/all")
-@cached(ttl_minutes=5, key_prefix="ebs")
-async def get_all_volumes(region: Optional[str] = Query(None)) -> Dict[str, Union[List[Dict[str, Any]], str]]:
+async def get_all_volumes(
+    region: Optional[str] = Query(None),
+    regions: Optional[List[str]] = Query(None)
+) -> StreamingResponse:
     """
-    Get list of all EBS volumes
+    Get list of all EBS volumes, streamed as pages arrive
     
     Args:
         region: AWS region to scan (optional, defaults to configured region)
+        regions: AWS regions to scan concurrently (optional, overrides region)
     
     Returns:
-        Dictionary containing list of all EBS volumes
+        Streamed JSON document containing list of all EBS volumes
     """
     try:
-        # Use provided region or default from settings
+        # Use provided regions, region or default from settings
         target_region = region or settings.aws_region
+        target_regions = regions or [target_region]
         
-        # Get EC2 client for specific region (EBS uses EC2 client)
-        factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=target_region)
-        response = ec2_client.describe_volumes()
+        # Fetch the first page of each region before responding, so a scan
+        # that cannot start at all still fails with a 500
+        results = await asyncio.gather(*(_open_region_pages(r) for r in target_regions), return_exceptions=True)
         
-        volumes = []
-        for volume in response.get('Volumes', []):
-            volume_id = volume.get('VolumeId')
-            size = volume.get('Size', 0)
-            volume_type = volume.get('VolumeType', 'unknown')
-            state = volume.get('State', 'unknown')
-            
-            # Get volume name from tags
-            volume_name = 'N/A'
-            for tag in volume.get('Tags', []):
-                if tag.get('Key') == 'Name':
-                    volume_name = tag.get('Value', 'N/A')
-                    break
-            
-            # Check if attached
-            attachments = volume.get('Attachments', [])
-            attached_to = attachments[0].get('InstanceId') if attachments else None
-            
-            volumes.append({
-                "id": volume_id,
-                "name": volume_name,
-                "size": size,
-                "type": volume_type,
-                "state": state,
-                "attached_to": attached_to
-            })
+        started = {}
+        failed_regions = {}
+        for scanned_region, result in zip(target_regions, results):
+            if isinstance(result, Exception):
+                logger.error(f"Error scanning EBS volumes in region {scanned_region}: {str(result)}")
+                failed_regions[scanned_region] = str(result)
+            else:
+                started[scanned_region] = result
+        
+        if not started:
+            raise next(r for r in results if isinstance(r, Exception))
         
-        logger.info(f"Found {len(volumes)} total EBS volumes in region {target_region}")
-        return {"volumes": volumes, "region": target_region}
+        return StreamingResponse(
+            _stream_all_volumes(target_regions, started, failed_regions),
+            media_type="application/json"
+        )
         
     except Exception as e:
         logger.error(f"Error fetching all EBS volumes: {str(e)}")
@@ -145,23 +297,15 @@ async def get_volume_details(volume_id: str, region: Optional[str] = Query(None)
         # Use provided region or default from settings
         target_region = region or settings.aws_region
         
-        factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=target_region)
-        
-        response = ec2_client.describe_volumes(VolumeIds=[volume_id])
+        # Concurrent detail requests in a region share one describe_volumes call
+        volume = await get_volume_batcher(target_region).get(volume_id)
         
-        if not response.get('Volumes'):
+        if volume is None:
             raise HTTPException(status_code=404, detail=f"Volume {volume_id} not found")
         
-        volume = response['Volumes'][0]
-        
         # Get volume name from tags
-        volume_name = 'N/A'
-        tags = {}
-        for tag in volume.get('Tags', []):
-            tags[tag.get('Key')] = tag.get('Value')
-            if tag.get('Key') == 'Name':
-                volume_name = tag.get('Value', 'N/A')
+        tags = {tag['Key']: tag['Value'] for tag in volume.get('Tags', ())}
+        volume_name = tags.get('Name', 'N/A')
         
         # Get attachment information
         attachments = []
@@ -170,7 +314,7 @@ async def get_volume_details(volume_id: str, region: Optional[str] = Query(None)
                 "instance_id": attachment.get('InstanceId'),
                 "device": attachment.get('Device'),
                 "state": attachment.get('State'),
-                "attach_time": attachment.get('AttachTime').isoformat() if attachment.get('AttachTime') else None,
+                "attach_time": attachment.get('AttachTime'),
                 "delete_on_termination": attachment.get('DeleteOnTermination')
             })
         
@@ -180,7 +324,7 @@ async def get_volume_details(volume_id: str, region: Optional[str] = Query(None)
             "size": volume.get('Size'),
             "type": volume.get('VolumeType'),
             "state": volume.get('State'),
-            "create_time": volume.get('CreateTime').isoformat() if volume.get('CreateTime') else None,
+            "create_time": volume.get('CreateTime'),
             "availability_zone": volume.get('AvailabilityZone'),
             "snapshot_id": volume.get('SnapshotId'),
             "iops": volume.get('Iops'),
@@ -205,6 +349,29 @@ async def get_volume_details(volume_id: str, region: Optional[str] = Query(None)
         )
 
 
+async def _volume_in_use_detail(volume_id: str, region: str) -> str:
+    """
+    Explain why an in-use volume cannot be deleted
+    
+    Args:
+        volume_id: The EBS volume ID
+        region: AWS region where the volume exists
+    
+    Returns:
+        Error message naming the attached instances, when they can be looked up
+    """
+    try:
+        volume = await get_volume_batcher(region).get(volume_id)
+    except Exception as e:
+        logger.warning(f"Could not look up attachments of volume {volume_id}: {str(e)}")
+        volume = None
+    
+    instance_ids = [att['InstanceId'] for att in (volume or {}).get('Attachments', []) if att.get('InstanceId')]
+    if not instance_ids:
+        return f"Volume {volume_id} is in use. Detach before deleting."
+    return f"Volume {volume_id} is attached to instances: {', '.join(instance_ids)}. Detach before deleting."
+
+
 @router.delete("/{volume_id}")
 async def delete_volume(volume_id: str, region: Optional[str] = Query(None)) -> Dict[str, Any]:
     """
@@ -222,28 +389,19 @@ async def delete_volume(volume_id: str, region: Optional[str] = Query(None)) ->
         target_region = region or settings.aws_region
         
         factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=target_region)
-        
-        # First verify the volume exists and is available
-        response = ec2_client.describe_volumes(VolumeIds=[volume_id])
-        
-        if not response.get('Volumes'):
-            raise HTTPException(status_code=404, detail=f"Volume {volume_id} not found")
-        
-        volume = response['Volumes'][0]
-        state = volume.get('State')
-        
-        # Check if volume is attached
-        if state == 'in-use':
-            attachments = volume.get('Attachments', [])
-            attached_instances = [att.get('InstanceId') for att in attachments]
-            raise HTTPException(
-                status_code=400,
-                detail=f"Volume {volume_id} is attached to instances: {', '.join(attached_instances)}. Detach before deleting."
-            )
+        ec2_client = factory.get_client('ec2', target_region)
         
-        # Delete the volume
-        ec2_client.delete_volume(VolumeId=volume_id)
+        # Delete directly; EC2 itself rejects unknown and attached volumes, so
+        # the volume is only described when explaining an attachment
+        try:
+            await asyncio.to_thread(ec2_client.delete_volume, VolumeId=volume_id)
+        except ClientError as e:
+            error_code = e.response['Error']['Code']
+            if error_code == 'InvalidVolume.NotFound':
+                raise HTTPException(status_code=404, detail=f"Volume {volume_id} not found")
+            if error_code == 'VolumeInUse':
+                raise HTTPException(status_code=400, detail=await _volume_in_use_detail(volume_id, target_region))
+            raise
         
         logger.info(f"Deleted volume {volume_id} in region {target_region}")
         
@@ -1,73 +1,238 @@
 from fastapi import APIRouter, HTTPException, Query
-from datetime import datetime, timezone, timedelta
-from typing import List, Dict, Any, Optional, Union
-from core.aws_client import get_aws_client_factory
+from fastapi.responses import StreamingResponse
+from typing import AsyncIterator, Iterator, List, Dict, Any, Optional, Tuple
+from core.aws_client import NAME_TAG_PROJECTION, get_aws_client_factory
 from core.cache import cached, invalidate_cache
+from core.ec2_batcher import get_instance_batcher, get_terminate_batcher
+from core.stopped_instances import fetch_unused_instances
 from core.config import settings
+import asyncio
+import jmespath
 import logging
+import orjson
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Cap concurrent regional scans to stay within EC2 API throttling limits
+REGION_SCAN_LIMIT = asyncio.Semaphore(8)
+
+# Fields returned by /unused, projected from each describe_instances page
+UNUSED_INSTANCES_EXPRESSION = jmespath.compile(
+    "Reservations[].Instances[].{id: InstanceId, name: " + NAME_TAG_PROJECTION + ", "
+    "type: InstanceType || 'unknown', state: 'stopped', launch_time: LaunchTime, "
+    "state_reason: StateTransitionReason}"
+)
+
+# Fields returned by /all, projected from each describe_instances page
+ALL_INSTANCES_EXPRESSION = jmespath.compile(
+    "Reservations[].Instances[].{id: InstanceId, name: " + NAME_TAG_PROJECTION + ", "
+    "type: InstanceType || 'unknown', state: State.Name || 'unknown'}"
+)
+
+# Sub-lists of an instance returned by the details endpoint
+SECURITY_GROUPS_EXPRESSION = jmespath.compile("SecurityGroups[].{id: GroupId, name: GroupName}")
+NETWORK_INTERFACES_EXPRESSION = jmespath.compile(
+    "NetworkInterfaces[].{id: NetworkInterfaceId, private_ip: PrivateIpAddress, public_ip: Association.PublicIp}"
+)
+BLOCK_DEVICE_MAPPINGS_EXPRESSION = jmespath.compile(
+    "BlockDeviceMappings[].{device_name: DeviceName, volume_id: Ebs.VolumeId, status: Ebs.Status}"
+)
+
+
+def _extract_name_and_tags(instance: Dict[str, Any]) -> Tuple[str, Dict[str, str]]:
+    """
+    Build an instance's tag mapping and read its Name tag from it
+    
+    Args:
+        instance: Instance from a describe_instances response
+    
+    Returns:
+        Tuple of the instance name ('N/A' if untagged) and its tags by key
+    """
+    tags = {tag['Key']: tag['Value'] for tag in instance.get('Tags') or ()}
+    return tags.get('Name', 'N/A'), tags
+
+
+async def _resolve_regions(region: Optional[str], all_regions: bool) -> List[str]:
+    """
+    Work out which regions a request scans
+    
+    Args:
+        region: Region requested, if any
+        all_regions: Whether to scan every region enabled for the account
+    
+    Returns:
+        Regions to scan, the requested or default one first when not scanning all
+    """
+    if not all_regions:
+        return [region or settings.aws_region]
+    
+    ec2_client = get_aws_client_factory().get_client('ec2', settings.aws_region)
+    response = await asyncio.to_thread(ec2_client.describe_regions, AllRegions=False)
+    return sorted(r['RegionName'] for r in response.get('Regions', []))
+
+
+async def _scan_unused_region(region: str) -> List[Dict[str, Any]]:
+    """
+    Fetch the unused instances in a region, projected with JMESPath
+    
+    Args:
+        region: AWS region to scan
+    
+    Returns:
+        List of projected instance dictionaries tagged with their region
+    """
+    ec2_client = get_aws_client_factory().get_client('ec2', region)
+    
+    async with REGION_SCAN_LIMIT:
+        instances = await asyncio.to_thread(fetch_unused_instances, ec2_client, UNUSED_INSTANCES_EXPRESSION)
+    for instance in instances:
+        instance['region'] = region
+    return instances
+
+
+async def _next_page(pages: Iterator[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Fetch the next describe_instances page in a worker thread, or None when exhausted"""
+    async with REGION_SCAN_LIMIT:
+        return await asyncio.to_thread(next, pages, None)
+
+
+async def _open_region_pages(region: str) -> Tuple[Iterator[Dict[str, Any]], Optional[Dict[str, Any]]]:
+    """
+    Start paging through every EC2 instance in a region
+    
+    Args:
+        region: AWS region to scan
+    
+    Returns:
+        Tuple of the page iterator and its first page
+    """
+    paginator = get_aws_client_factory().get_client('ec2', region).get_paginator('describe_instances')
+    pages = iter(paginator.paginate(PaginationConfig={'PageSize': 1000}))
+    return pages, await _next_page(pages)
+
+
+async def _produce_instance_pages(
+    region: str,
+    pages: Iterator[Dict[str, Any]],
+    page: Optional[Dict[str, Any]],
+    queue: asyncio.Queue,
+    failed_regions: Dict[str, str]
+) -> None:
+    """
+    Queue the projected instances of each remaining page in a region, then None
+    
+    Args:
+        region: AWS region being scanned
+        pages: describe_instances page iterator for the region
+        page: First page, already fetched
+        queue: Queue consumed by the response stream
+        failed_regions: Mapping to record a mid-scan failure in
+    """
+    try:
+        while page is not None:
+            instances = ALL_INSTANCES_EXPRESSION.search(page) or []
+            for instance in instances:
+                instance['region'] = region
+            await queue.put(instances)
+            page = await _next_page(pages)
+    except Exception as e:
+        logger.error("Error scanning EC2 instances in region %s", region, exc_info=True)
+        failed_regions[region] = str(e)
+    finally:
+        await queue.put(None)
+
+
+async def _stream_all_instances(
+    target_regions: List[str],
+    started: Dict[str, Tuple[Iterator[Dict[str, Any]], Dict[str, Any]]],
+    failed_regions: Dict[str, str]
+) -> AsyncIterator[bytes]:
+    """
+    Stream the /all response body page by page as regions are scanned
+    
+    Args:
+        target_regions: Regions requested
+        started: Page iterator and first page of every region that responded
+        failed_regions: Regions that already failed to respond
+    
+    Yields:
+        Chunks of the JSON response body
+    """
+    queue: asyncio.Queue = asyncio.Queue(maxsize=len(started))
+    producers = [
+        asyncio.create_task(_produce_instance_pages(r, pages, page, queue, failed_regions))
+        for r, (pages, page) in started.items()
+    ]
+    
+    try:
+        yield b'{"region":' + orjson.dumps(target_regions[0]) + b',"regions":' + orjson.dumps(target_regions) + b',"instances":['
+        
+        total = 0
+        separator = b''
+        remaining = len(producers)
+        while remaining:
+            instances = await queue.get()
+            if instances is None:
+                remaining -= 1
+            elif instances:
+                total += len(instances)
+                yield separator + b','.join(map(orjson.dumps, instances))
+                separator = b','
+        
+        yield b'],"failed_regions":' + orjson.dumps(failed_regions) + b'}'
+        logger.info("Streamed %d total EC2 instances in regions %s", total, ', '.join(target_regions))
+    finally:
+        for producer in producers:
+            producer.cancel()
+
 
 @router.get("/unused")
 @cached(ttl_minutes=5, key_prefix="ec2")
-async def get_unused_instances(region: Optional[str] = Query(None)) -> Dict[str, Union[List[Dict[str, Any]], str]]:
+async def get_unused_instances(
+    region: Optional[str] = Query(None),
+    all_regions: bool = Query(False)
+) -> Dict[str, Any]:
     """
     Get list of stopped EC2 instances that have been stopped for more than 7 days
     
     Args:
         region: AWS region to scan (optional, defaults to configured region)
+        all_regions: Scan every enabled region concurrently instead (optional)
     
     Returns:
         Dictionary containing list of unused EC2 instances
     """
     try:
-        # Use provided region or default from settings
-        target_region = region or settings.aws_region
+        # Use every enabled region, provided region or default from settings
+        target_regions = await _resolve_regions(region, all_regions)
         
-        # Get EC2 client for specific region
-        factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=target_region)
+        # Get the instances stopped by a user over a week ago, across every page of every region
+        results = await asyncio.gather(*(_scan_unused_region(r) for r in target_regions), return_exceptions=True)
         
-        # Get all stopped instances
-        response = ec2_client.describe_instances(
-            Filters=[{'Name': 'instance-state-name', 'Values': ['stopped']}]
-        )
-        
-        cutoff = datetime.now(timezone.utc) - timedelta(days=7)
         unused = []
-        
-        for reservation in response.get('Reservations', []):
-            for instance in reservation.get('Instances', []):
-                instance_id = instance.get('InstanceId')
-                instance_type = instance.get('InstanceType', 'unknown')
-                launch_time = instance.get('LaunchTime')
-                state_transition_reason = instance.get('StateTransitionReason', '')
-                
-                # Get instance name from tags
-                instance_name = 'N/A'
-                for tag in instance.get('Tags', []):
-                    if tag.get('Key') == 'Name':
-                        instance_name = tag.get('Value', 'N/A')
-                        break
-                
-                # Check if instance was stopped by user
-                if 'User initiated' in state_transition_reason:
-                    unused.append({
-                        "id": instance_id,
-                        "name": instance_name,
-                        "type": instance_type,
-                        "state": "stopped",
-                        "launch_time": launch_time.isoformat() if launch_time else None,
-                        "state_reason": state_transition_reason
-                    })
-        
-        logger.info(f"Found {len(unused)} unused EC2 instances in region {target_region}")
-        return {"unused_instances": unused, "region": target_region}
+        failed_regions = {}
+        for scanned_region, result in zip(target_regions, results):
+            if isinstance(result, Exception):
+                logger.error("Error scanning EC2 instances in region %s", scanned_region, exc_info=result)
+                failed_regions[scanned_region] = str(result)
+            else:
+                unused.extend(result)
+        
+        if len(failed_regions) == len(target_regions):
+            raise next(r for r in results if isinstance(r, Exception))
+        
+        logger.info("Found %d unused EC2 instances in regions %s", len(unused), ', '.join(target_regions))
+        return {
+            "unused_instances": unused,
+            "region": target_regions[0],
+            "regions": target_regions,
+            "failed_regions": failed_regions
+        }
         
     except Exception as e:
-        logger.error(f"Error fetching unused EC2 instances: {str(e)}")
+        logger.error("Error fetching unused EC2 instances", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch EC2 instances: {str(e)}"
@@ -75,52 +240,47 @@ async def get_unused_instances(region: Optional[str] = Query(None)) -> Dict[str,
 
 
 @router.get("/all")
-@cached(ttl_minutes=5, key_prefix="ec2")
-async def get_all_instances(region: Optional[str] = Query(None)) -> Dict[str, Union[List[Dict[str, Any]], str]]:
+async def get_all_instances(
+    region: Optional[str] = Query(None),
+    all_regions: bool = Query(False)
+) -> StreamingResponse:
     """
-    Get list of all EC2 instances
+    Get list of all EC2 instances, streamed as pages arrive
     
     Args:
         region: AWS region to scan (optional, defaults to configured region)
+        all_regions: Scan every enabled region concurrently instead (optional)
     
     Returns:
-        Dictionary containing list of all EC2 instances
+        Streamed JSON document containing list of all EC2 instances
     """
     try:
-        # Use provided region or default from settings
-        target_region = region or settings.aws_region
-        
-        # Get EC2 client for specific region
-        factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=target_region)
-        response = ec2_client.describe_instances()
-        
-        instances = []
-        for reservation in response.get('Reservations', []):
-            for instance in reservation.get('Instances', []):
-                instance_id = instance.get('InstanceId')
-                instance_type = instance.get('InstanceType', 'unknown')
-                state = instance.get('State', {}).get('Name', 'unknown')
-                
-                # Get instance name from tags
-                instance_name = 'N/A'
-                for tag in instance.get('Tags', []):
-                    if tag.get('Key') == 'Name':
-                        instance_name = tag.get('Value', 'N/A')
-                        break
-                
-                instances.append({
-                    "id": instance_id,
-                    "name": instance_name,
-                    "type": instance_type,
-                    "state": state
-                })
-        
-        logger.info(f"Found {len(instances)} total EC2 instances in region {target_region}")
-        return {"instances": instances, "region": target_region}
+        # Use every enabled region, provided region or default from settings
+        target_regions = await _resolve_regions(region, all_regions)
+        
+        # Fetch the first page of each region before responding, so a scan
+        # that cannot start at all still fails with a 500
+        results = await asyncio.gather(*(_open_region_pages(r) for r in target_regions), return_exceptions=True)
+        
+        started = {}
+        failed_regions = {}
+        for scanned_region, result in zip(target_regions, results):
+            if isinstance(result, Exception):
+                logger.error("Error scanning EC2 instances in region %s", scanned_region, exc_info=result)
+                failed_regions[scanned_region] = str(result)
+            else:
+                started[scanned_region] = result
+        
+        if not started:
+            raise next(r for r in results if isinstance(r, Exception))
+        
+        return StreamingResponse(
+            _stream_all_instances(target_regions, started, failed_regions),
+            media_type="application/json"
+        )
         
     except Exception as e:
-        logger.error(f"Error fetching all EC2 instances: {str(e)}")
+        logger.error("Error fetching all EC2 instances", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch EC2 instances: {str(e)}"
@@ -144,49 +304,25 @@ async def get_instance_details(instance_id: str, region: Optional[str] = Query(N
         # Use provided region or default from settings
         target_region = region or settings.aws_region
         
-        factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=target_region)
+        # Concurrent detail requests in a region share one describe_instances call
+        instance = await get_instance_batcher(target_region).get(instance_id)
         
-        response = ec2_client.describe_instances(InstanceIds=[instance_id])
-        
-        if not response.get('Reservations'):
+        if instance is None:
             raise HTTPException(status_code=404, detail=f"Instance {instance_id} not found")
         
-        instance = response['Reservations'][0]['Instances'][0]
-        
         # Get instance name from tags
-        instance_name = 'N/A'
-        tags = {}
-        for tag in instance.get('Tags', []):
-            tags[tag.get('Key')] = tag.get('Value')
-            if tag.get('Key') == 'Name':
-                instance_name = tag.get('Value', 'N/A')
+        instance_name, tags = _extract_name_and_tags(instance)
         
-        # Get security groups
-        security_groups = [
-            {
-                "id": sg.get('GroupId'),
-                "name": sg.get('GroupName')
-            }
-            for sg in instance.get('SecurityGroups', [])
-        ]
-        
-        # Get network interfaces
-        network_interfaces = [
-            {
-                "id": ni.get('NetworkInterfaceId'),
-                "private_ip": ni.get('PrivateIpAddress'),
-                "public_ip": ni.get('Association', {}).get('PublicIp')
-            }
-            for ni in instance.get('NetworkInterfaces', [])
-        ]
+        # Get security groups and network interfaces
+        security_groups = SECURITY_GROUPS_EXPRESSION.search(instance) or []
+        network_interfaces = NETWORK_INTERFACES_EXPRESSION.search(instance) or []
         
         details = {
             "id": instance.get('InstanceId'),
             "name": instance_name,
             "type": instance.get('InstanceType'),
             "state": instance.get('State', {}).get('Name'),
-            "launch_time": instance.get('LaunchTime').isoformat() if instance.get('LaunchTime') else None,
+            "launch_time": instance.get('LaunchTime'),
             "availability_zone": instance.get('Placement', {}).get('AvailabilityZone'),
             "vpc_id": instance.get('VpcId'),
             "subnet_id": instance.get('SubnetId'),
@@ -201,23 +337,16 @@ async def get_instance_details(instance_id: str, region: Optional[str] = Query(N
             "security_groups": security_groups,
             "network_interfaces": network_interfaces,
             "tags": tags,
-            "block_device_mappings": [
-                {
-                    "device_name": bdm.get('DeviceName'),
-                    "volume_id": bdm.get('Ebs', {}).get('VolumeId'),
-                    "status": bdm.get('Ebs', {}).get('Status')
-                }
-                for bdm in instance.get('BlockDeviceMappings', [])
-            ]
+            "block_device_mappings": BLOCK_DEVICE_MAPPINGS_EXPRESSION.search(instance) or []
         }
         
-        logger.info(f"Retrieved details for instance {instance_id} in region {target_region}")
+        logger.info("Retrieved details for instance %s in region %s", instance_id, target_region)
         return details
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error fetching instance details for {instance_id}: {str(e)}")
+        logger.error("Error fetching instance details for %s", instance_id, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch instance details: {str(e)}"
@@ -240,29 +369,28 @@ async def terminate_instance(instance_id: str, region: Optional[str] = Query(Non
         # Use provided region or default from settings
         target_region = region or settings.aws_region
         
-        factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=target_region)
-        
         # First verify the instance exists and get its current state
-        response = ec2_client.describe_instances(InstanceIds=[instance_id])
+        instance = await get_instance_batcher(target_region).get(instance_id)
         
-        if not response.get('Reservations'):
+        if instance is None:
             raise HTTPException(status_code=404, detail=f"Instance {instance_id} not found")
         
-        instance = response['Reservations'][0]['Instances'][0]
         current_state = instance.get('State', {}).get('Name')
         
-        # Terminate the instance
-        terminate_response = ec2_client.terminate_instances(InstanceIds=[instance_id])
+        # Terminate the instance, together with any other concurrent terminations
+        terminated_instance = await get_terminate_batcher(target_region).get(instance_id)
+        if terminated_instance is None:
+            raise RuntimeError(f"No termination state returned for instance {instance_id}")
         
-        terminated_instance = terminate_response['TerminatingInstances'][0]
         previous_state = terminated_instance['PreviousState']['Name']
         current_state = terminated_instance['CurrentState']['Name']
         
-        logger.info(f"Terminated instance {instance_id} in region {target_region} (previous state: {previous_state}, current state: {current_state})")
+        logger.info("Terminated instance %s in region %s (previous state: %s, current state: %s)", instance_id, target_region, previous_state, current_state)
         
-        # Invalidate EC2 cache after deletion
+        # Invalidate EC2 cache after deletion, and EBS since terminating
+        # deletes or detaches the instance's volumes
         invalidate_cache("ec2")
+        invalidate_cache("ebs")
         
         return {
             "success": True,
@@ -275,7 +403,7 @@ async def terminate_instance(instance_id: str, region: Optional[str] = Query(Non
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error terminating instance {instance_id}: {str(e)}")
+        logger.error("Error terminating instance %s", instance_id, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to terminate instance: {str(e)}"
@@ -1,68 +1,478 @@
-from fastapi import APIRouter, HTTPException
-from typing import List, Dict, Any
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
+from botocore.exceptions import ClientError
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime, timezone, timedelta
 from core.aws_client import get_iam_client
 from core.cache import cached, invalidate_cache
+from core.config import settings
+from functools import partial
+from itertools import chain
+from operator import itemgetter
+import asyncio
+import csv
+import io
 import logging
+import time
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Fields present on every list_roles item, read in one call per role
+ROLE_FIELDS = itemgetter('RoleName', 'CreateDate', 'Arn')
+
+# Fields present on every list_users item
+USER_FIELDS = itemgetter('UserName', 'CreateDate', 'Arn')
+
+# Fields present on every list_access_keys item
+ACCESS_KEY_FIELDS = itemgetter('AccessKeyId', 'Status', 'CreateDate')
+
+# Fields present on every attached managed policy item
+POLICY_FIELDS = itemgetter('PolicyName', 'PolicyArn')
+
+# Cap concurrent per-user lookups to stay within IAM API throttling limits
+USER_LOOKUP_LIMIT = asyncio.Semaphore(20)
+
+# Credential report generation checks, one second apart, before giving up
+CREDENTIAL_REPORT_POLLS = 10
+
+# Path of the roles AWS services create and manage for themselves
+SERVICE_LINKED_ROLE_PATH = '/aws-service-role/'
+
+# Credential report columns for each of a user's two access key slots
+ACCESS_KEY_SLOTS = ('access_key_1', 'access_key_2')
+
+# Roles and access keys not used for this long are reported as unused
+UNUSED_AFTER = timedelta(days=90)
+
+
+def _list_roles(iam_client) -> List[Dict[str, Any]]:
+    """
+    List every IAM role across all list_roles pages
+    
+    Args:
+        iam_client: boto3 IAM client
+    
+    Returns:
+        List of role dictionaries as returned by list_roles
+    """
+    paginator = iam_client.get_paginator('list_roles')
+    pages = paginator.paginate(PaginationConfig={'PageSize': 1000})
+    return list(chain.from_iterable(page.get('Roles', []) for page in pages))
+
+
+def _list_role_last_used(iam_client) -> Dict[str, Optional[datetime]]:
+    """
+    Get when every IAM role was last used, in one paginated pass
+    
+    get_account_authorization_details carries RoleLastUsed for each role,
+    so no per-role get_role calls are needed.
+    
+    Args:
+        iam_client: boto3 IAM client
+    
+    Returns:
+        Mapping of role name to last used date, or None if never used
+    """
+    paginator = iam_client.get_paginator('get_account_authorization_details')
+    return {
+        role['RoleName']: role.get('RoleLastUsed', {}).get('LastUsedDate')
+        for page in paginator.paginate(Filter=['Role'], PaginationConfig={'PageSize': 1000})
+        for role in page.get('RoleDetailList', [])
+    }
+
+
+def _list_users(iam_client) -> List[Dict[str, Any]]:
+    """
+    List every IAM user across all list_users pages
+    
+    Args:
+        iam_client: boto3 IAM client
+    
+    Returns:
+        List of user dictionaries as returned by list_users
+    """
+    paginator = iam_client.get_paginator('list_users')
+    pages = paginator.paginate(PaginationConfig={'PageSize': 1000})
+    return list(chain.from_iterable(page.get('Users', []) for page in pages))
+
+
+def _get_credential_report(iam_client) -> Dict[str, Dict[str, str]]:
+    """
+    Get the account's IAM credential report, generating it if needed
+    
+    Args:
+        iam_client: boto3 IAM client
+    
+    Returns:
+        Mapping of user name to that user's credential report row
+    """
+    for _ in range(CREDENTIAL_REPORT_POLLS):
+        if iam_client.generate_credential_report().get('State') == 'COMPLETE':
+            break
+        time.sleep(1)
+    
+    # Raises ReportInProgress if generation did not finish in time
+    content = iam_client.get_credential_report()['Content'].decode('utf-8')
+    return {row['user']: row for row in csv.DictReader(io.StringIO(content))}
+
+
+def _cutoff() -> datetime:
+    """Get the last used date before which a role or access key counts as unused"""
+    return datetime.now(timezone.utc) - UNUSED_AFTER
+
+
+def _parse_report_date(value: Optional[str]) -> Optional[datetime]:
+    """Parse a credential report timestamp, or None for N/A and no_information"""
+    try:
+        return datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return None
+
+
+async def _credential_report_or_none() -> Optional[Dict[str, Dict[str, str]]]:
+    """
+    Get the credential report in a worker thread, or None so callers probe
+    users individually
+    
+    Returns:
+        Mapping of user name to report row, or None if the report is unavailable
+    """
+    try:
+        return await asyncio.to_thread(_get_credential_report, get_iam_client())
+    except Exception as e:
+        logger.warning("Credential report unavailable, checking users individually: %s", e)
+        return None
+
+
+def _get_user_access(
+    iam_client,
+    user_name: str,
+    report: Optional[Dict[str, Dict[str, str]]] = None
+) -> Tuple[List[Dict[str, Any]], bool]:
+    """
+    Get a user's access keys and whether they can sign in to the console
+    
+    Args:
+        iam_client: boto3 IAM client
+        user_name: The IAM user name
+        report: Credential report rows by user name, if available
+    
+    Returns:
+        Tuple of access key metadata and console access flag
+    """
+    keys = _list_access_keys(iam_client, user_name)
+    
+    # Console access is a password_enabled column in the credential report
+    if report is not None and user_name in report:
+        return keys, report[user_name].get('password_enabled') == 'true'
+    
+    # Get login profile (console access); any error other than a missing
+    # profile, such as throttling, must not read as "no console access"
+    try:
+        iam_client.get_login_profile(UserName=user_name)
+        has_console_access = True
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchEntity':
+            raise
+        has_console_access = False
+    return keys, has_console_access
+
+
+def _list_access_keys(iam_client, user_name: str) -> List[Dict[str, Any]]:
+    """
+    List a user's access keys
+    
+    Args:
+        iam_client: boto3 IAM client
+        user_name: The IAM user name
+    
+    Returns:
+        List of access key metadata as returned by list_access_keys
+    """
+    return iam_client.list_access_keys(UserName=user_name).get('AccessKeyMetadata', [])
+
+
+def _report_key_usage(row: Dict[str, str]) -> Dict[datetime, Optional[datetime]]:
+    """
+    Map a credential report row's access key creation times to last used dates
+    
+    The report lists keys by slot rather than ID, so keys are matched to
+    their slot by creation time.
+    
+    Args:
+        row: The user's credential report row
+    
+    Returns:
+        Mapping of key creation time (to the second) to last used date
+    """
+    return {
+        created: _parse_report_date(row.get(f'{slot}_last_used_date'))
+        for slot in ACCESS_KEY_SLOTS
+        if (created := _parse_report_date(row.get(f'{slot}_last_rotated'))) is not None
+    }
+
+
+async def _get_keys_last_used(
+    iam_client,
+    user_keys: List[Tuple[str, Dict[str, Any]]],
+    report: Optional[Dict[str, Dict[str, str]]] = None
+) -> List[Optional[datetime]]:
+    """
+    Get when each access key was last used
+    
+    Keys covered by the credential report are answered from it; the rest
+    are looked up with get_access_key_last_used, all concurrently in worker
+    threads. A failed lookup counts as never used.
+    
+    Args:
+        iam_client: boto3 IAM client, shared by all threads
+        user_keys: (user name, access key metadata) pairs
+        report: Credential report rows by user name, if available
+    
+    Returns:
+        Last used date per key, in order, or None if never used or unknown
+    """
+    report_usage = {user_name: _report_key_usage(row) for user_name, row in (report or {}).items()}
+    
+    async def lookup_key(user_name: str, key: Dict[str, Any]) -> Optional[datetime]:
+        usage = report_usage.get(user_name, {})
+        created = key['CreateDate'].replace(microsecond=0)
+        if created in usage:
+            return usage[created]
+        async with USER_LOOKUP_LIMIT:
+            response = await asyncio.to_thread(iam_client.get_access_key_last_used, AccessKeyId=key['AccessKeyId'])
+        return response.get('AccessKeyLastUsed', {}).get('LastUsedDate')
+    
+    results = await asyncio.gather(*(lookup_key(user_name, key) for user_name, key in user_keys), return_exceptions=True)
+    return [None if isinstance(result, Exception) else result for result in results]
+
+
+async def _lookup_users(iam_client, lookup: Callable[[Any, str], Any], users: List[Dict[str, Any]]) -> List[Any]:
+    """
+    Run a blocking per-user lookup for every user concurrently in worker threads
+    
+    Args:
+        iam_client: boto3 IAM client, shared by all threads
+        lookup: Function taking the client and a user name
+        users: Users as returned by list_users
+    
+    Returns:
+        Lookup result per user, in order, or the exception it raised
+    """
+    async def lookup_user(user_name: str) -> Any:
+        async with USER_LOOKUP_LIMIT:
+            return await asyncio.to_thread(lookup, iam_client, user_name)
+    
+    return await asyncio.gather(*(lookup_user(user.get('UserName')) for user in users), return_exceptions=True)
+
+
+@dataclass(frozen=True, slots=True)
+class RoleRecord:
+    """
+    Role entry returned by the role listings
+    
+    The listings return ORJSONResponse themselves, so orjson encodes these
+    records directly instead of FastAPI re-validating and converting them.
+    """
+    name: str
+    create_date: datetime
+    last_used_date: Optional[datetime]
+    arn: str
+    description: str = 'N/A'
+
+
+def _role_summary(role: Dict[str, Any], last_used_date: Optional[datetime]) -> RoleRecord:
+    """
+    Build the role entry returned by the role listings
+    
+    Args:
+        role: Role dictionary as returned by list_roles
+        last_used_date: When the role was last used, if ever
+    
+    Returns:
+        Record describing the role
+    """
+    role_name, create_date, arn = ROLE_FIELDS(role)
+    return RoleRecord(role_name, create_date, last_used_date, arn, role.get('Description', 'N/A'))
+
+
+@dataclass(frozen=True)
+class IAMSnapshot:
+    """Account-wide IAM scans, taken together"""
+    roles: List[RoleRecord] = field(default_factory=list)
+    service_linked_roles: List[RoleRecord] = field(default_factory=list)  # Kept apart from roles
+    report: Optional[Dict[str, Dict[str, str]]] = None  # Credential report rows by user name
+    updated_at: Optional[datetime] = None
+    
+    def list_roles(self, include_service_linked: bool = False) -> List[RoleRecord]:
+        """Get the roles, with the AWS service-linked roles only if asked for"""
+        return self.roles + self.service_linked_roles if include_service_linked else self.roles
+
+
+# Latest snapshot, replaced wholesale by the refresher so readers never see a
+# partial update. Endpoints read it instead of scanning IAM on each request.
+_SNAPSHOT = IAMSnapshot()
+_snapshot_lock = asyncio.Lock()
+
+# Bumped by reset_snapshot, so a scan that overlapped a deletion is redone
+# instead of republishing the deleted role or user
+_snapshot_generation = 0
+_refresh_task: Optional[asyncio.Task] = None
+
+
+async def _take_snapshot() -> IAMSnapshot:
+    """
+    Scan IAM roles and the credential report and publish the result
+    
+    The role listing, the authorization details and the credential report
+    are fetched concurrently in worker threads; list_roles is kept for
+    fields such as Description that the authorization details omit. The
+    scan is repeated if a deletion reset the snapshot while it ran.
+    
+    Returns:
+        The new snapshot
+    """
+    global _SNAPSHOT
+    iam_client = get_iam_client()
+    while True:
+        generation = _snapshot_generation
+        roles, last_used_dates, report = await asyncio.gather(
+            asyncio.to_thread(_list_roles, iam_client),
+            asyncio.to_thread(_list_role_last_used, iam_client),
+            _credential_report_or_none()
+        )
+        if generation == _snapshot_generation:
+            break
+        logger.info("IAM changed during the snapshot scan, rescanning")
+    
+    # Service-linked roles can only be removed through their service, so the
+    # listings leave them out unless asked
+    summaries, service_linked = [], []
+    for role in roles:
+        summary = _role_summary(role, last_used_dates.get(role['RoleName']))
+        (service_linked if role.get('Path', '').startswith(SERVICE_LINKED_ROLE_PATH) else summaries).append(summary)
+    
+    _SNAPSHOT = IAMSnapshot(
+        roles=summaries,
+        service_linked_roles=service_linked,
+        report=report,
+        updated_at=datetime.now()
+    )
+    return _SNAPSHOT
+
+
+async def refresh_snapshot() -> IAMSnapshot:
+    """Take a new snapshot, one at a time"""
+    async with _snapshot_lock:
+        return await _take_snapshot()
+
+
+async def get_snapshot() -> IAMSnapshot:
+    """
+    Get the latest snapshot, taking a new one if none exists yet or the
+    refresher has fallen behind
+    
+    Concurrent callers wait for a single new snapshot.
+    """
+    max_age = timedelta(seconds=settings.iam_refresh_interval * 2)
+    if _SNAPSHOT.updated_at is None or datetime.now() - _SNAPSHOT.updated_at > max_age:
+        async with _snapshot_lock:
+            if _SNAPSHOT.updated_at is None or datetime.now() - _SNAPSHOT.updated_at > max_age:
+                return await _take_snapshot()
+    return _SNAPSHOT
+
+
+def reset_snapshot() -> None:
+    """Drop the snapshot so the next request rescans, e.g. after a deletion"""
+    global _SNAPSHOT, _snapshot_generation
+    _snapshot_generation += 1
+    _SNAPSHOT = IAMSnapshot()
+
+
+async def _snapshot(fresh: bool) -> IAMSnapshot:
+    """Get the snapshot, or take a new one when a request asks for fresh results"""
+    return await refresh_snapshot() if fresh else await get_snapshot()
+
+
+def _drop_cached(func: Callable) -> None:
+    """Drop the cached results of an IAM listing so its next call rescans"""
+    invalidate_cache(f"iam:{func.__name__}:")
+
+
+async def _refresh_snapshot_loop() -> None:
+    """Keep the snapshot fresh for the lifetime of the app"""
+    while True:
+        try:
+            await refresh_snapshot()
+        except Exception as e:
+            logger.warning("Error refreshing IAM snapshot: %s", e)
+        await asyncio.sleep(settings.iam_refresh_interval)
+
+
+def start_snapshot_refresher() -> None:
+    """Start the background snapshot refresher (call from app startup)"""
+    global _refresh_task
+    if _refresh_task is None or _refresh_task.done():
+        _refresh_task = asyncio.create_task(_refresh_snapshot_loop())
+
+
+async def stop_snapshot_refresher() -> None:
+    """Stop the background snapshot refresher (call from app shutdown)"""
+    global _refresh_task
+    if _refresh_task is not None:
+        _refresh_task.cancel()
+        try:
+            await _refresh_task
+        except asyncio.CancelledError:
+            pass
+        _refresh_task = None
+
+
+def _unused_roles(roles: List[RoleRecord]) -> List[RoleRecord]:
+    """
+    Select the roles never used or not used in 90+ days
+    
+    Args:
+        roles: Role records as built by _role_summary
+    
+    Returns:
+        The unused role records
+    """
+    cutoff_date = _cutoff()
+    return [
+        role for role in roles
+        if role.last_used_date is None or role.last_used_date < cutoff_date
+    ]
+
 
 @router.get("/unused")
-@cached(ttl_minutes=5, key_prefix="iam")
-async def get_unused_iam_roles() -> Dict[str, List[Dict[str, Any]]]:
+async def get_unused_iam_roles(
+    fresh: bool = Query(False),
+    include_service_linked: bool = Query(False)
+) -> ORJSONResponse:
     """
     Get list of IAM roles that haven't been used in 90+ days
     
+    Args:
+        fresh: Rescan IAM instead of serving the latest snapshot (optional)
+        include_service_linked: Also list AWS service-linked roles (optional)
+    
     Returns:
         Dictionary containing list of potentially unused IAM roles
     """
     try:
-        iam_client = get_iam_client()
+        # Get all roles with their last used dates
+        roles = (await _snapshot(fresh)).list_roles(include_service_linked)
+        
+        unused_roles = _unused_roles(roles)
         
-        # Get all roles
-        paginator = iam_client.get_paginator('list_roles')
-        
-        unused_roles = []
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=90)
-        
-        for page in paginator.paginate():
-            for role in page.get('Roles', []):
-                role_name = role.get('RoleName')
-                create_date = role.get('CreateDate')
-                
-                try:
-                    # Get role last used information
-                    role_details = iam_client.get_role(RoleName=role_name)
-                    role_last_used = role_details.get('Role', {}).get('RoleLastUsed', {})
-                    last_used_date = role_last_used.get('LastUsedDate')
-                    
-                    # Consider role unused if never used or not used in 90+ days
-                    is_unused = False
-                    if last_used_date is None:
-                        is_unused = True
-                    elif last_used_date < cutoff_date:
-                        is_unused = True
-                    
-                    if is_unused:
-                        unused_roles.append({
-                            "name": role_name,
-                            "create_date": create_date.isoformat() if create_date else None,
-                            "last_used_date": last_used_date.isoformat() if last_used_date else None,
-                            "arn": role.get('Arn'),
-                            "description": role.get('Description', 'N/A')
-                        })
-                        
-                except Exception as e:
-                    logger.warning(f"Could not check role {role_name}: {str(e)}")
-                    continue
-        
-        logger.info(f"Found {len(unused_roles)} potentially unused IAM roles")
-        return {"unused_roles": unused_roles}
+        logger.info("Found %d potentially unused IAM roles", len(unused_roles))
+        return ORJSONResponse({"unused_roles": unused_roles})
         
     except Exception as e:
-        logger.error(f"Error fetching unused IAM roles: {str(e)}")
+        logger.error("Error fetching unused IAM roles", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch IAM roles: {str(e)}"
@@ -70,217 +480,330 @@ async def get_unused_iam_roles() -> Dict[str, List[Dict[str, Any]]]:
 
 
 @router.get("/all")
-@cached(ttl_minutes=5, key_prefix="iam")
-async def get_all_roles() -> Dict[str, List[Dict[str, Any]]]:
+async def get_all_roles(
+    fresh: bool = Query(False),
+    include_service_linked: bool = Query(False)
+) -> ORJSONResponse:
     """
     Get list of all IAM roles
     
+    Args:
+        fresh: Rescan IAM instead of serving the latest snapshot (optional)
+        include_service_linked: Also list AWS service-linked roles (optional)
+    
     Returns:
         Dictionary containing list of all IAM roles
     """
     try:
-        iam_client = get_iam_client()
+        # Get all roles with their last used dates
+        roles = (await _snapshot(fresh)).list_roles(include_service_linked)
         
-        # Get all roles
-        paginator = iam_client.get_paginator('list_roles')
-        
-        roles = []
-        for page in paginator.paginate():
-            for role in page.get('Roles', []):
-                role_name = role.get('RoleName')
-                create_date = role.get('CreateDate')
-                
-                try:
-                    # Get role last used information
-                    role_details = iam_client.get_role(RoleName=role_name)
-                    role_last_used = role_details.get('Role', {}).get('RoleLastUsed', {})
-                    last_used_date = role_last_used.get('LastUsedDate')
-                    
-                    roles.append({
-                        "name": role_name,
-                        "create_date": create_date.isoformat() if create_date else None,
-                        "last_used_date": last_used_date.isoformat() if last_used_date else None,
-                        "arn": role.get('Arn'),
-                        "description": role.get('Description', 'N/A')
-                    })
-                except Exception as e:
-                    logger.warning(f"Could not get details for role {role_name}: {str(e)}")
-                    roles.append({
-                        "name": role_name,
-                        "create_date": create_date.isoformat() if create_date else None,
-                        "last_used_date": None,
-                        "arn": role.get('Arn'),
-                        "description": role.get('Description', 'N/A')
-                    })
-        
-        logger.info(f"Found {len(roles)} total IAM roles")
-        return {"roles": roles}
+        logger.info("Found %d total IAM roles", len(roles))
+        return ORJSONResponse({"roles": roles})
         
     except Exception as e:
-        logger.error(f"Error fetching all IAM roles: {str(e)}")
+        logger.error("Error fetching all IAM roles", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch IAM roles: {str(e)}"
         )
 
 
+def _access_key_summary(key: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Build the access key entry nested in user entries
+    
+    Args:
+        key: Access key metadata as returned by list_access_keys
+    
+    Returns:
+        Dictionary describing the access key
+    """
+    access_key_id, status, create_date = ACCESS_KEY_FIELDS(key)
+    return {
+        "access_key_id": access_key_id,
+        "status": status,
+        "create_date": create_date
+    }
+
+
+def _user_summary(user: Dict[str, Any], keys: List[Dict[str, Any]], has_console_access: bool) -> Dict[str, Any]:
+    """
+    Build the user entry returned by the user listing
+    
+    Args:
+        user: User dictionary as returned by list_users
+        keys: The user's access key metadata
+        has_console_access: Whether the user can sign in to the console
+    
+    Returns:
+        Dictionary describing the user
+    """
+    user_name, create_date, arn = USER_FIELDS(user)
+    return {
+        "name": user_name,
+        "create_date": create_date,
+        "arn": arn,
+        "has_console_access": has_console_access,
+        "access_keys_count": len(keys),
+        "access_keys": [_access_key_summary(key) for key in keys]
+    }
+
+
+def _unused_user_rows(users: List[Dict[str, Any]], user_access: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Build entries for the users with neither console access nor access keys
+    
+    Args:
+        users: Users as returned by list_users
+        user_access: _get_user_access result per user, or the exception it raised
+    
+    Returns:
+        List of unused user entries
+    """
+    unused_users = []
+    for user, access in zip(users, user_access):
+        if isinstance(access, Exception):
+            logger.warning("Could not check user %s: %s", user['UserName'], access)
+            continue
+        
+        keys, has_console_access = access
+        
+        # Consider user unused if no access keys and no console access
+        if not has_console_access and len(keys) == 0:
+            unused_users.append(_user_summary(user, keys, has_console_access))
+    return unused_users
+
+
+@cached(ttl_minutes=settings.iam_cache_ttl_minutes, key_prefix="iam")
+async def _fetch_unused_users() -> List[Dict[str, Any]]:
+    """
+    Find the unused users, cached for the user listing
+    
+    Returns:
+        List of unused user entries
+    """
+    iam_client = get_iam_client()
+    
+    # Get all users and the credential report, then every user's access concurrently
+    users, snapshot = await asyncio.gather(
+        asyncio.to_thread(_list_users, iam_client),
+        get_snapshot()
+    )
+    user_access = await _lookup_users(iam_client, partial(_get_user_access, report=snapshot.report), users)
+    return _unused_user_rows(users, user_access)
+
+
 @router.get("/users/unused")
-@cached(ttl_minutes=5, key_prefix="iam")
-async def get_unused_iam_users() -> Dict[str, List[Dict[str, Any]]]:
+async def get_unused_iam_users(fresh: bool = Query(False)) -> Dict[str, List[Dict[str, Any]]]:
     """
-    Get list of IAM users with no console or programmatic access in 90+ days
+    Get list of IAM users with neither console access nor access keys
+    
+    Args:
+        fresh: Rescan IAM instead of serving cached results (optional)
     
     Returns:
         Dictionary containing list of potentially unused IAM users
     """
     try:
-        iam_client = get_iam_client()
+        if fresh:
+            await refresh_snapshot()
+            _drop_cached(_fetch_unused_users)
+        unused_users = await _fetch_unused_users()
         
-        # Get all users
-        paginator = iam_client.get_paginator('list_users')
-        
-        unused_users = []
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=90)
-        
-        for page in paginator.paginate():
-            for user in page.get('Users', []):
-                user_name = user.get('UserName')
-                create_date = user.get('CreateDate')
-                
-                try:
-                    # Get user access key information
-                    access_keys = iam_client.list_access_keys(UserName=user_name)
-                    keys = access_keys.get('AccessKeyMetadata', [])
-                    
-                    # Get login profile (console access)
-                    has_console_access = False
-                    try:
-                        iam_client.get_login_profile(UserName=user_name)
-                        has_console_access = True
-                    except:
-                        has_console_access = False
-                    
-                    # Check if user has any recent activity
-                    last_console_login = None
-                    last_key_access = None
-                    
-                    try:
-                        user_details = iam_client.get_user(UserName=user_name)
-                        # Note: LastUsed info is not directly available in get_user
-                        # This would require CloudTrail analysis for production use
-                    except:
-                        pass
-                    
-                    # Consider user unused if no access keys and no console access
-                    # or if they have access but haven't used it recently
-                    is_unused = False
-                    if not has_console_access and len(keys) == 0:
-                        is_unused = True
-                    
-                    if is_unused or (has_console_access or len(keys) > 0):
-                        unused_users.append({
-                            "name": user_name,
-                            "create_date": create_date.isoformat() if create_date else None,
-                            "arn": user.get('Arn'),
-                            "has_console_access": has_console_access,
-                            "access_keys_count": len(keys),
-                            "access_keys": [
-                                {
-                                    "access_key_id": key.get('AccessKeyId'),
-                                    "status": key.get('Status'),
-                                    "create_date": key.get('CreateDate').isoformat() if key.get('CreateDate') else None
-                                }
-                                for key in keys
-                            ]
-                        })
-                        
-                except Exception as e:
-                    logger.warning(f"Could not check user {user_name}: {str(e)}")
-                    continue
-        
-        logger.info(f"Found {len(unused_users)} IAM users")
+        logger.info("Found %d potentially unused IAM users", len(unused_users))
         return {"unused_users": unused_users}
         
     except Exception as e:
-        logger.error(f"Error fetching IAM users: {str(e)}")
+        logger.error("Error fetching IAM users", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch IAM users: {str(e)}"
         )
 
 
+async def _unused_key_rows(
+    iam_client,
+    users: List[Dict[str, Any]],
+    users_keys: List[Any],
+    report: Optional[Dict[str, Dict[str, str]]]
+) -> List[Dict[str, Any]]:
+    """
+    Build entries for the access keys never used or not used in 90+ days
+    
+    Args:
+        iam_client: boto3 IAM client
+        users: Users as returned by list_users
+        users_keys: Access key metadata per user, or the exception listing raised
+        report: Credential report rows by user name, if available
+    
+    Returns:
+        List of unused access key entries
+    """
+    # Pair every key with its user, then look up all keys' last use at once
+    user_keys = []
+    for user, keys in zip(users, users_keys):
+        user_name = user['UserName']
+        if isinstance(keys, Exception):
+            logger.warning("Could not check access keys for user %s: %s", user_name, keys)
+            continue
+        user_keys.extend((user_name, key) for key in keys)
+    last_used_dates = await _get_keys_last_used(iam_client, user_keys, report)
+    
+    unused_keys = []
+    cutoff_date = _cutoff()
+    
+    for (user_name, key), last_used_date in zip(user_keys, last_used_dates):
+        # Consider key unused if never used or not used in 90+ days
+        if last_used_date is None or last_used_date < cutoff_date:
+            access_key_id, status, create_date = ACCESS_KEY_FIELDS(key)
+            unused_keys.append({
+                "access_key_id": access_key_id,
+                "user_name": user_name,
+                "status": status,
+                "create_date": create_date,
+                "last_used_date": last_used_date,
+                "security_risk": "High" if status == "Active" else "Low"
+            })
+    return unused_keys
+
+
+@cached(ttl_minutes=settings.iam_cache_ttl_minutes, key_prefix="iam")
+async def _fetch_unused_access_keys() -> List[Dict[str, Any]]:
+    """
+    Find the unused access keys, cached for the access key listing
+    
+    Returns:
+        List of unused access key entries
+    """
+    iam_client = get_iam_client()
+    
+    # Get all users and the credential report, then their access keys concurrently
+    users, snapshot = await asyncio.gather(
+        asyncio.to_thread(_list_users, iam_client),
+        get_snapshot()
+    )
+    users_keys = await _lookup_users(iam_client, _list_access_keys, users)
+    return await _unused_key_rows(iam_client, users, users_keys, snapshot.report)
+
+
 @router.get("/access-keys/unused")
-@cached(ttl_minutes=5, key_prefix="iam")
-async def get_unused_access_keys() -> Dict[str, List[Dict[str, Any]]]:
+async def get_unused_access_keys(fresh: bool = Query(False)) -> Dict[str, List[Dict[str, Any]]]:
     """
     Get list of access keys that haven't been used in 90+ days
     
+    Args:
+        fresh: Rescan IAM instead of serving cached results (optional)
+    
     Returns:
         Dictionary containing list of potentially unused access keys
     """
     try:
-        iam_client = get_iam_client()
+        if fresh:
+            await refresh_snapshot()
+            _drop_cached(_fetch_unused_access_keys)
+        unused_keys = await _fetch_unused_access_keys()
         
-        # Get all users
-        paginator = iam_client.get_paginator('list_users')
-        
-        unused_keys = []
-        cutoff_date = datetime.now(timezone.utc) - timedelta(days=90)
-        
-        for page in paginator.paginate():
-            for user in page.get('Users', []):
-                user_name = user.get('UserName')
-                
-                try:
-                    # Get access keys for user
-                    access_keys = iam_client.list_access_keys(UserName=user_name)
-                    keys = access_keys.get('AccessKeyMetadata', [])
-                    
-                    for key in keys:
-                        key_id = key.get('AccessKeyId')
-                        create_date = key.get('CreateDate')
-                        status = key.get('Status')
-                        
-                        # Get last used information
-                        try:
-                            key_last_used = iam_client.get_access_key_last_used(AccessKeyId=key_id)
-                            last_used_info = key_last_used.get('AccessKeyLastUsed', {})
-                            last_used_date = last_used_info.get('LastUsedDate')
-                        except:
-                            last_used_date = None
-                        
-                        # Consider key unused if never used or not used in 90+ days
-                        is_unused = False
-                        if last_used_date is None:
-                            is_unused = True
-                        elif last_used_date < cutoff_date:
-                            is_unused = True
-                        
-                        if is_unused:
-                            unused_keys.append({
-                                "access_key_id": key_id,
-                                "user_name": user_name,
-                                "status": status,
-                                "create_date": create_date.isoformat() if create_date else None,
-                                "last_used_date": last_used_date.isoformat() if last_used_date else None,
-                                "security_risk": "High" if status == "Active" else "Low"
-                            })
-                        
-                except Exception as e:
-                    logger.warning(f"Could not check access keys for user {user_name}: {str(e)}")
-                    continue
-        
-        logger.info(f"Found {len(unused_keys)} potentially unused access keys")
+        logger.info("Found %d potentially unused access keys", len(unused_keys))
         return {"unused_keys": unused_keys}
         
     except Exception as e:
-        logger.error(f"Error fetching unused access keys: {str(e)}")
+        logger.error("Error fetching unused access keys", exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch access keys: {str(e)}"
         )
 
 
+@cached(ttl_minutes=settings.iam_cache_ttl_minutes, key_prefix="iam")
+async def _fetch_iam_summary(include_service_linked: bool = False) -> Dict[str, List[Any]]:
+    """
+    Build every IAM listing, cached for the summary
+    
+    Users are listed and their access keys checked once for both the user
+    and the access key results; the roles come from the IAM snapshot.
+    
+    Args:
+        include_service_linked: Also list AWS service-linked roles
+    
+    Returns:
+        Dictionary containing the unused roles, all roles, unused users and
+        unused access keys
+    """
+    iam_client = get_iam_client()
+    
+    # Get all users and the snapshot, then every user's access concurrently
+    users, snapshot = await asyncio.gather(
+        asyncio.to_thread(_list_users, iam_client),
+        get_snapshot()
+    )
+    user_access = await _lookup_users(iam_client, partial(_get_user_access, report=snapshot.report), users)
+    
+    users_keys = [access if isinstance(access, Exception) else access[0] for access in user_access]
+    unused_keys = await _unused_key_rows(iam_client, users, users_keys, snapshot.report)
+    
+    roles = snapshot.list_roles(include_service_linked)
+    return {
+        "unused_roles": _unused_roles(roles),
+        "roles": roles,
+        "unused_users": _unused_user_rows(users, user_access),
+        "unused_keys": unused_keys
+    }
+
+
+@router.get("/summary")
+async def get_iam_summary(
+    fresh: bool = Query(False),
+    include_service_linked: bool = Query(False)
+) -> ORJSONResponse:
+    """
+    Get every IAM listing in one request
+    
+    Args:
+        fresh: Rescan IAM instead of serving cached results (optional)
+        include_service_linked: Also list AWS service-linked roles (optional)
+    
+    Returns:
+        Dictionary containing the unused roles, all roles, unused users and
+        unused access keys
+    """
+    try:
+        if fresh:
+            await refresh_snapshot()
+            _drop_cached(_fetch_iam_summary)
+        summary = await _fetch_iam_summary(include_service_linked=include_service_linked)
+        
+        logger.info("Built IAM summary: %s", ', '.join(f"{len(v)} {k}" for k, v in summary.items()))
+        return ORJSONResponse(summary)
+    
+    except Exception as e:
+        logger.error("Error fetching IAM summary", exc_info=True)
+        raise HTTPException(
+            status_code=500,
+            detail=f"Failed to fetch IAM summary: {str(e)}"
+        )
+
+
+async def _optional_call(default: Any, func: Callable[..., Any], **kwargs) -> Any:
+    """
+    Run a details lookup in a worker thread, treating a missing entity as empty
+    
+    Args:
+        default: Value to return if IAM reports NoSuchEntity
+        func: boto3 client method to call
+        **kwargs: Parameters for the call
+    
+    Returns:
+        The call's response, or default
+    """
+    try:
+        return await asyncio.to_thread(func, **kwargs)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchEntity':
+            raise
+        return default
+
+
 @router.get("/roles/{role_name}")
 @cached(ttl_minutes=10, key_prefix="iam")
 async def get_role_details(role_name: str) -> Dict[str, Any]:
@@ -296,39 +819,21 @@ async def get_role_details(role_name: str) -> Dict[str, Any]:
     try:
         iam_client = get_iam_client()
         
-        # Get role details
-        role_response = iam_client.get_role(RoleName=role_name)
+        # Get the role, its policies and its tags concurrently
+        role_response, policies_response, inline_response, tags_response = await asyncio.gather(
+            asyncio.to_thread(iam_client.get_role, RoleName=role_name),
+            _optional_call({}, iam_client.list_attached_role_policies, RoleName=role_name),
+            _optional_call({}, iam_client.list_role_policies, RoleName=role_name),
+            _optional_call({}, iam_client.list_role_tags, RoleName=role_name)
+        )
         role = role_response.get('Role', {})
         
-        # Get attached policies
-        attached_policies = []
-        try:
-            policies_response = iam_client.list_attached_role_policies(RoleName=role_name)
-            attached_policies = [
-                {
-                    "name": policy.get('PolicyName'),
-                    "arn": policy.get('PolicyArn')
-                }
-                for policy in policies_response.get('AttachedPolicies', [])
-            ]
-        except:
-            pass
-        
-        # Get inline policies
-        inline_policies = []
-        try:
-            inline_response = iam_client.list_role_policies(RoleName=role_name)
-            inline_policies = inline_response.get('PolicyNames', [])
-        except:
-            pass
-        
-        # Get role tags
-        tags = {}
-        try:
-            tags_response = iam_client.list_role_tags(RoleName=role_name)
-            tags = {tag.get('Key'): tag.get('Value') for tag in tags_response.get('Tags', [])}
-        except:
-            pass
+        attached_policies = [
+            {"name": policy_name, "arn": policy_arn}
+            for policy_name, policy_arn in map(POLICY_FIELDS, policies_response.get('AttachedPolicies', []))
+        ]
+        inline_policies = inline_response.get('PolicyNames', [])
+        tags = {tag.get('Key'): tag.get('Value') for tag in tags_response.get('Tags', [])}
         
         # Get last used information
         role_last_used = role.get('RoleLastUsed', {})
@@ -338,10 +843,10 @@ async def get_role_details(role_name: str) -> Dict[str, Any]:
             "arn": role.get('Arn'),
             "role_id": role.get('RoleId'),
             "path": role.get('Path'),
-            "create_date": role.get('CreateDate').isoformat() if role.get('CreateDate') else None,
+            "create_date": role.get('CreateDate'),
             "description": role.get('Description', 'N/A'),
             "max_session_duration": role.get('MaxSessionDuration'),
-            "last_used_date": role_last_used.get('LastUsedDate').isoformat() if role_last_used.get('LastUsedDate') else None,
+            "last_used_date": role_last_used.get('LastUsedDate'),
             "last_used_region": role_last_used.get('Region'),
             "assume_role_policy": role.get('AssumeRolePolicyDocument'),
             "attached_policies": attached_policies,
@@ -349,19 +854,69 @@ async def get_role_details(role_name: str) -> Dict[str, Any]:
             "tags": tags
         }
         
-        logger.info(f"Retrieved details for role {role_name}")
+        logger.info("Retrieved details for role %s", role_name)
         return details
         
     except iam_client.exceptions.NoSuchEntityException:
         raise HTTPException(status_code=404, detail=f"Role {role_name} not found")
     except Exception as e:
-        logger.error(f"Error fetching role details for {role_name}: {str(e)}")
+        logger.error("Error fetching role details for %s", role_name, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch role details: {str(e)}"
         )
 
 
+def _list_all(iam_client, operation: str, field: str, **kwargs) -> List[Any]:
+    """
+    Page through an IAM list operation, which returns at most 100 items per call
+    
+    Args:
+        iam_client: boto3 IAM client
+        operation: Paginated list operation name, e.g. 'list_role_policies'
+        field: Response field holding the items
+        **kwargs: Operation parameters, e.g. RoleName
+    
+    Returns:
+        Items from every page
+    """
+    pages = iam_client.get_paginator(operation).paginate(**kwargs, PaginationConfig={'PageSize': 1000})
+    return list(chain.from_iterable(page.get(field, []) for page in pages))
+
+
+def _listed(items: Any) -> List[Any]:
+    """Get the items listed for a force delete, or none if listing failed"""
+    return [] if isinstance(items, Exception) else items
+
+
+def _check_cleanup(name: str, results: List[Any]) -> None:
+    """
+    Log IAM errors from the best-effort cleanup before a force delete
+    
+    A failed cleanup step surfaces when the delete itself is rejected, so
+    it does not stop the other steps; any other exception is re-raised.
+    
+    Args:
+        name: The role or user being deleted
+        results: Results of the cleanup calls, or the exceptions they raised
+    """
+    for result in results:
+        if isinstance(result, ClientError):
+            logger.warning("Cleanup before deleting %s failed: %s", name, result)
+        elif isinstance(result, Exception):
+            raise result
+
+
+def _delete_login_profile(iam_client, user_name: str) -> None:
+    """Delete a user's login profile, if it has one"""
+    try:
+        iam_client.delete_login_profile(UserName=user_name)
+        logger.info("Deleted login profile for user %s", user_name)
+    except ClientError as e:
+        if e.response['Error']['Code'] != 'NoSuchEntity':
+            raise
+
+
 @router.delete("/roles/{role_name}")
 async def delete_role(role_name: str, force: bool = False) -> Dict[str, Any]:
     """
@@ -379,54 +934,61 @@ async def delete_role(role_name: str, force: bool = False) -> Dict[str, Any]:
         
         # Check if role exists
         try:
-            iam_client.get_role(RoleName=role_name)
+            await asyncio.to_thread(iam_client.get_role, RoleName=role_name)
         except iam_client.exceptions.NoSuchEntityException:
             raise HTTPException(status_code=404, detail=f"Role {role_name} not found")
         
         if force:
-            # Detach all managed policies
-            try:
-                policies_response = iam_client.list_attached_role_policies(RoleName=role_name)
-                for policy in policies_response.get('AttachedPolicies', []):
-                    iam_client.detach_role_policy(
-                        RoleName=role_name,
-                        PolicyArn=policy.get('PolicyArn')
-                    )
-                    logger.info(f"Detached policy {policy.get('PolicyName')} from role {role_name}")
-            except:
-                pass
+            # List the role's policies and instance profiles, then detach,
+            # delete and remove them all concurrently
+            attached, inline, profiles = await asyncio.gather(
+                asyncio.to_thread(_list_all, iam_client, 'list_attached_role_policies', 'AttachedPolicies', RoleName=role_name),
+                asyncio.to_thread(_list_all, iam_client, 'list_role_policies', 'PolicyNames', RoleName=role_name),
+                asyncio.to_thread(_list_all, iam_client, 'list_instance_profiles_for_role', 'InstanceProfiles', RoleName=role_name),
+                return_exceptions=True
+            )
+            _check_cleanup(role_name, [attached, inline, profiles])
+            
+            async def detach_policy(policy: Dict[str, Any]) -> None:
+                await asyncio.to_thread(
+                    iam_client.detach_role_policy,
+                    RoleName=role_name,
+                    PolicyArn=policy.get('PolicyArn')
+                )
+                logger.info("Detached policy %s from role %s", policy.get('PolicyName'), role_name)
             
-            # Delete all inline policies
-            try:
-                inline_response = iam_client.list_role_policies(RoleName=role_name)
-                for policy_name in inline_response.get('PolicyNames', []):
-                    iam_client.delete_role_policy(
-                        RoleName=role_name,
-                        PolicyName=policy_name
-                    )
-                    logger.info(f"Deleted inline policy {policy_name} from role {role_name}")
-            except:
-                pass
+            async def delete_inline_policy(policy_name: str) -> None:
+                await asyncio.to_thread(
+                    iam_client.delete_role_policy,
+                    RoleName=role_name,
+                    PolicyName=policy_name
+                )
+                logger.info("Deleted inline policy %s from role %s", policy_name, role_name)
             
-            # Remove role from instance profiles
-            try:
-                profiles_response = iam_client.list_instance_profiles_for_role(RoleName=role_name)
-                for profile in profiles_response.get('InstanceProfiles', []):
-                    iam_client.remove_role_from_instance_profile(
-                        InstanceProfileName=profile.get('InstanceProfileName'),
-                        RoleName=role_name
-                    )
-                    logger.info(f"Removed role {role_name} from instance profile {profile.get('InstanceProfileName')}")
-            except:
-                pass
+            async def remove_from_profile(profile: Dict[str, Any]) -> None:
+                await asyncio.to_thread(
+                    iam_client.remove_role_from_instance_profile,
+                    InstanceProfileName=profile.get('InstanceProfileName'),
+                    RoleName=role_name
+                )
+                logger.info("Removed role %s from instance profile %s", role_name, profile.get('InstanceProfileName'))
+            
+            results = await asyncio.gather(
+                *(detach_policy(policy) for policy in _listed(attached)),
+                *(delete_inline_policy(name) for name in _listed(inline)),
+                *(remove_from_profile(profile) for profile in _listed(profiles)),
+                return_exceptions=True
+            )
+            _check_cleanup(role_name, results)
         
         # Delete the role
-        iam_client.delete_role(RoleName=role_name)
+        await asyncio.to_thread(iam_client.delete_role, RoleName=role_name)
         
-        logger.info(f"Deleted role {role_name}")
+        logger.info("Deleted role %s", role_name)
         
         # Invalidate IAM cache after deletion
         invalidate_cache("iam")
+        reset_snapshot()
         
         return {
             "success": True,
@@ -437,7 +999,7 @@ async def delete_role(role_name: str, force: bool = False) -> Dict[str, Any]:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting role {role_name}: {str(e)}")
+        logger.error("Error deleting role %s", role_name, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to delete role: {str(e)}"
@@ -459,78 +1021,43 @@ async def get_user_details(user_name: str) -> Dict[str, Any]:
     try:
         iam_client = get_iam_client()
         
-        # Get user details
-        user_response = iam_client.get_user(UserName=user_name)
+        # Get the user, its policies, keys, console access, groups and tags concurrently
+        (
+            user_response,
+            policies_response,
+            inline_response,
+            keys_response,
+            login_profile,
+            groups_response,
+            tags_response
+        ) = await asyncio.gather(
+            asyncio.to_thread(iam_client.get_user, UserName=user_name),
+            _optional_call({}, iam_client.list_attached_user_policies, UserName=user_name),
+            _optional_call({}, iam_client.list_user_policies, UserName=user_name),
+            _optional_call({}, iam_client.list_access_keys, UserName=user_name),
+            _optional_call(None, iam_client.get_login_profile, UserName=user_name),
+            _optional_call({}, iam_client.list_groups_for_user, UserName=user_name),
+            _optional_call({}, iam_client.list_user_tags, UserName=user_name)
+        )
         user = user_response.get('User', {})
         
-        # Get attached policies
-        attached_policies = []
-        try:
-            policies_response = iam_client.list_attached_user_policies(UserName=user_name)
-            attached_policies = [
-                {
-                    "name": policy.get('PolicyName'),
-                    "arn": policy.get('PolicyArn')
-                }
-                for policy in policies_response.get('AttachedPolicies', [])
-            ]
-        except:
-            pass
-        
-        # Get inline policies
-        inline_policies = []
-        try:
-            inline_response = iam_client.list_user_policies(UserName=user_name)
-            inline_policies = inline_response.get('PolicyNames', [])
-        except:
-            pass
-        
-        # Get access keys
-        access_keys = []
-        try:
-            keys_response = iam_client.list_access_keys(UserName=user_name)
-            access_keys = [
-                {
-                    "access_key_id": key.get('AccessKeyId'),
-                    "status": key.get('Status'),
-                    "create_date": key.get('CreateDate').isoformat() if key.get('CreateDate') else None
-                }
-                for key in keys_response.get('AccessKeyMetadata', [])
-            ]
-        except:
-            pass
-        
-        # Check console access
-        has_console_access = False
-        try:
-            iam_client.get_login_profile(UserName=user_name)
-            has_console_access = True
-        except:
-            pass
-        
-        # Get user groups
-        groups = []
-        try:
-            groups_response = iam_client.list_groups_for_user(UserName=user_name)
-            groups = [group.get('GroupName') for group in groups_response.get('Groups', [])]
-        except:
-            pass
-        
-        # Get user tags
-        tags = {}
-        try:
-            tags_response = iam_client.list_user_tags(UserName=user_name)
-            tags = {tag.get('Key'): tag.get('Value') for tag in tags_response.get('Tags', [])}
-        except:
-            pass
+        attached_policies = [
+            {"name": policy_name, "arn": policy_arn}
+            for policy_name, policy_arn in map(POLICY_FIELDS, policies_response.get('AttachedPolicies', []))
+        ]
+        inline_policies = inline_response.get('PolicyNames', [])
+        access_keys = [_access_key_summary(key) for key in keys_response.get('AccessKeyMetadata', [])]
+        has_console_access = login_profile is not None
+        groups = [group.get('GroupName') for group in groups_response.get('Groups', [])]
+        tags = {tag.get('Key'): tag.get('Value') for tag in tags_response.get('Tags', [])}
         
         details = {
             "name": user.get('UserName'),
             "arn": user.get('Arn'),
             "user_id": user.get('UserId'),
             "path": user.get('Path'),
-            "create_date": user.get('CreateDate').isoformat() if user.get('CreateDate') else None,
-            "password_last_used": user.get('PasswordLastUsed').isoformat() if user.get('PasswordLastUsed') else None,
+            "create_date": user.get('CreateDate'),
+            "password_last_used": user.get('PasswordLastUsed'),
             "has_console_access": has_console_access,
             "attached_policies": attached_policies,
             "inline_policies": inline_policies,
@@ -539,13 +1066,13 @@ async def get_user_details(user_name: str) -> Dict[str, Any]:
             "tags": tags
         }
         
-        logger.info(f"Retrieved details for user {user_name}")
+        logger.info("Retrieved details for user %s", user_name)
         return details
         
     except iam_client.exceptions.NoSuchEntityException:
         raise HTTPException(status_code=404, detail=f"User {user_name} not found")
     except Exception as e:
-        logger.error(f"Error fetching user details for {user_name}: {str(e)}")
+        logger.error("Error fetching user details for %s", user_name, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to fetch user details: {str(e)}"
@@ -569,73 +1096,72 @@ async def delete_user(user_name: str, force: bool = False) -> Dict[str, Any]:
         
         # Check if user exists
         try:
-            iam_client.get_user(UserName=user_name)
+            await asyncio.to_thread(iam_client.get_user, UserName=user_name)
         except iam_client.exceptions.NoSuchEntityException:
             raise HTTPException(status_code=404, detail=f"User {user_name} not found")
         
         if force:
-            # Delete login profile
-            try:
-                iam_client.delete_login_profile(UserName=user_name)
-                logger.info(f"Deleted login profile for user {user_name}")
-            except:
-                pass
+            # Delete the login profile and list the user's keys, policies and
+            # groups, then delete, detach and remove them all concurrently
+            profile, keys, attached, inline, groups = await asyncio.gather(
+                asyncio.to_thread(_delete_login_profile, iam_client, user_name),
+                asyncio.to_thread(_list_all, iam_client, 'list_access_keys', 'AccessKeyMetadata', UserName=user_name),
+                asyncio.to_thread(_list_all, iam_client, 'list_attached_user_policies', 'AttachedPolicies', UserName=user_name),
+                asyncio.to_thread(_list_all, iam_client, 'list_user_policies', 'PolicyNames', UserName=user_name),
+                asyncio.to_thread(_list_all, iam_client, 'list_groups_for_user', 'Groups', UserName=user_name),
+                return_exceptions=True
+            )
+            _check_cleanup(user_name, [profile, keys, attached, inline, groups])
+            
+            async def delete_access_key(key: Dict[str, Any]) -> None:
+                await asyncio.to_thread(
+                    iam_client.delete_access_key,
+                    UserName=user_name,
+                    AccessKeyId=key.get('AccessKeyId')
+                )
+                logger.info("Deleted access key %s for user %s", key.get('AccessKeyId'), user_name)
             
-            # Delete access keys
-            try:
-                keys_response = iam_client.list_access_keys(UserName=user_name)
-                for key in keys_response.get('AccessKeyMetadata', []):
-                    iam_client.delete_access_key(
-                        UserName=user_name,
-                        AccessKeyId=key.get('AccessKeyId')
-                    )
-                    logger.info(f"Deleted access key {key.get('AccessKeyId')} for user {user_name}")
-            except:
-                pass
+            async def detach_policy(policy: Dict[str, Any]) -> None:
+                await asyncio.to_thread(
+                    iam_client.detach_user_policy,
+                    UserName=user_name,
+                    PolicyArn=policy.get('PolicyArn')
+                )
+                logger.info("Detached policy %s from user %s", policy.get('PolicyName'), user_name)
             
-            # Detach managed policies
-            try:
-                policies_response = iam_client.list_attached_user_policies(UserName=user_name)
-                for policy in policies_response.get('AttachedPolicies', []):
-                    iam_client.detach_user_policy(
-                        UserName=user_name,
-                        PolicyArn=policy.get('PolicyArn')
-                    )
-                    logger.info(f"Detached policy {policy.get('PolicyName')} from user {user_name}")
-            except:
-                pass
+            async def delete_inline_policy(policy_name: str) -> None:
+                await asyncio.to_thread(
+                    iam_client.delete_user_policy,
+                    UserName=user_name,
+                    PolicyName=policy_name
+                )
+                logger.info("Deleted inline policy %s from user %s", policy_name, user_name)
             
-            # Delete inline policies
-            try:
-                inline_response = iam_client.list_user_policies(UserName=user_name)
-                for policy_name in inline_response.get('PolicyNames', []):
-                    iam_client.delete_user_policy(
-                        UserName=user_name,
-                        PolicyName=policy_name
-                    )
-                    logger.info(f"Deleted inline policy {policy_name} from user {user_name}")
-            except:
-                pass
+            async def remove_from_group(group: Dict[str, Any]) -> None:
+                await asyncio.to_thread(
+                    iam_client.remove_user_from_group,
+                    UserName=user_name,
+                    GroupName=group.get('GroupName')
+                )
+                logger.info("Removed user %s from group %s", user_name, group.get('GroupName'))
             
-            # Remove from groups
-            try:
-                groups_response = iam_client.list_groups_for_user(UserName=user_name)
-                for group in groups_response.get('Groups', []):
-                    iam_client.remove_user_from_group(
-                        UserName=user_name,
-                        GroupName=group.get('GroupName')
-                    )
-                    logger.info(f"Removed user {user_name} from group {group.get('GroupName')}")
-            except:
-                pass
+            results = await asyncio.gather(
+                *(delete_access_key(key) for key in _listed(keys)),
+                *(detach_policy(policy) for policy in _listed(attached)),
+                *(delete_inline_policy(name) for name in _listed(inline)),
+                *(remove_from_group(group) for group in _listed(groups)),
+                return_exceptions=True
+            )
+            _check_cleanup(user_name, results)
         
         # Delete the user
-        iam_client.delete_user(UserName=user_name)
+        await asyncio.to_thread(iam_client.delete_user, UserName=user_name)
         
-        logger.info(f"Deleted user {user_name}")
+        logger.info("Deleted user %s", user_name)
         
         # Invalidate IAM cache after deletion
         invalidate_cache("iam")
+        reset_snapshot()
         
         return {
             "success": True,
@@ -646,7 +1172,7 @@ async def delete_user(user_name: str, force: bool = False) -> Dict[str, Any]:
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting user {user_name}: {str(e)}")
+        logger.error("Error deleting user %s", user_name, exc_info=True)
         raise HTTPException(
             status_code=500,
             detail=f"Failed to delete user: {str(e)}"
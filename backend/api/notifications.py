@@ -8,6 +8,17 @@ from core.tasks import send_alert_task
 logger = logging.getLogger(__name__)
 router = APIRouter()
 
+# Notification settings only change on restart, so parse them once at import
+EMAIL_RECIPIENTS = [e.strip() for e in (settings.notification_email_recipients or '').split(',') if e.strip()]
+SMTP_CONFIG = {
+    'smtp_server': settings.smtp_server or 'smtp.gmail.com',
+    'smtp_port': settings.smtp_port or 587,
+    'smtp_username': settings.smtp_username,
+    'smtp_password': settings.smtp_password,
+    'sender_email': settings.sender_email or 'noreply@cloudcleaner.local'
+}
+SMTP_CONFIGURED = bool(settings.smtp_username and settings.smtp_password)
+
 
 class NotificationConfig(BaseModel):
     """Configuration for notifications"""
@@ -43,10 +54,8 @@ async def send_alert(alert: ResourceAlert) -> Dict[str, Any]:
     """
     try:
         slack_webhook = settings.slack_webhook_url
-        email_recipients_str = settings.notification_email_recipients or ''
-        email_recipients = [e.strip() for e in email_recipients_str.split(',') if e.strip()] if email_recipients_str else []
         
-        logger.info(f"Alert request - Channel: {alert.channel}, Slack configured: {bool(slack_webhook)}, Email configured: {bool(email_recipients_str)}")
+        logger.info(f"Alert request - Channel: {alert.channel}, Slack configured: {bool(slack_webhook)}, Email configured: {bool(EMAIL_RECIPIENTS)}")
         
         # Validate configuration before queuing
         send_slack = alert.channel is None or alert.channel == 'slack'
@@ -58,21 +67,13 @@ async def send_alert(alert: ResourceAlert) -> Dict[str, Any]:
                 detail="Slack is not configured. Please set SLACK_WEBHOOK_URL in environment variables."
             )
         
-        if send_email and not email_recipients:
+        if send_email and not EMAIL_RECIPIENTS:
             raise HTTPException(
                 status_code=400,
                 detail="Email is not configured. Please set NOTIFICATION_EMAIL_RECIPIENTS in environment variables."
             )
         
-        smtp_config = {
-            'smtp_server': settings.smtp_server or 'smtp.gmail.com',
-            'smtp_port': settings.smtp_port or 587,
-            'smtp_username': settings.smtp_username,
-            'smtp_password': settings.smtp_password,
-            'sender_email': settings.sender_email or 'noreply@cloudcleaner.local'
-        }
-        
-        if send_email and not (smtp_config['smtp_username'] and smtp_config['smtp_password']):
+        if send_email and not SMTP_CONFIGURED:
             raise HTTPException(
                 status_code=400,
                 detail="Email SMTP credentials are not configured. Please set SMTP_USERNAME and SMTP_PASSWORD."
@@ -84,15 +85,15 @@ async def send_alert(alert: ResourceAlert) -> Dict[str, Any]:
             s3_count=alert.details.get('s3_count', 0),
             iam_users_count=alert.details.get('iam_users_count', 0),
             slack_webhook=slack_webhook if send_slack else None,
-            email_recipients=email_recipients if send_email else [],
-            smtp_config=smtp_config if send_email else {}
+            email_recipients=EMAIL_RECIPIENTS if send_email else [],
+            smtp_config=SMTP_CONFIG if send_email else {}
         )
         
         logger.info(f"Alert task queued with ID: {task.id}")
         return {
             'task_id': task.id,
             'slack_sent': send_slack and bool(slack_webhook),
-            'email_sent': send_email and bool(email_recipients),
+            'email_sent': send_email and bool(EMAIL_RECIPIENTS),
             'message': 'Alert is being processed in the background. Scanning all AWS regions for EC2 and EBS resources...'
         }
         
@@ -116,6 +117,6 @@ async def get_notification_config() -> Dict[str, Any]:
     """
     return {
         'slack_configured': bool(settings.slack_webhook_url),
-        'email_configured': bool(settings.smtp_username and settings.smtp_password),
-        'email_recipients': settings.notification_email_recipients.split(',') if settings.notification_email_recipients else []
+        'email_configured': SMTP_CONFIGURED,
+        'email_recipients': EMAIL_RECIPIENTS
     }
@@ -48,7 +48,7 @@ async def get_unused_s3_buckets() -> Dict[str, List[Dict[str, Any]]]:
                 if creation_date < cutoff_date or is_empty:
                     unused_buckets.append({
                         "name": bucket_name,
-                        "creation_date": creation_date.isoformat() if creation_date else None,
+                        "creation_date": creation_date,
                         "location": location,
                         "is_empty": is_empty
                     })
@@ -93,14 +93,14 @@ async def get_all_buckets() -> Dict[str, List[Dict[str, Any]]]:
                 
                 buckets.append({
                     "name": bucket_name,
-                    "creation_date": creation_date.isoformat() if creation_date else None,
+                    "creation_date": creation_date,
                     "location": location
                 })
             except Exception as e:
                 logger.warning(f"Could not get details for bucket {bucket_name}: {str(e)}")
                 buckets.append({
                     "name": bucket_name,
-                    "creation_date": creation_date.isoformat() if creation_date else None,
+                    "creation_date": creation_date,
                     "location": "unknown"
                 })
         
@@ -197,7 +197,7 @@ async def get_bucket_details(bucket_name: str) -> Dict[str, Any]:
         details = {
             "name": bucket_name,
             "location": location,
-            "creation_date": creation_date.isoformat() if creation_date else None,
+            "creation_date": creation_date,
             "object_count": object_count,
             "total_size_bytes": total_size,
             "total_size_mb": round(total_size / (1024 * 1024), 2),
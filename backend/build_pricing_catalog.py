@@ -0,0 +1,18 @@
+#!/usr/bin/env python3
+"""
+Script to build the static AWS price catalog used by the cost analysis API
+Usage: python build_pricing_catalog.py [output_path]
+"""
+import sys
+from pathlib import Path
+from core.pricing_catalog import build_price_table, write_price_table
+
+if __name__ == "__main__":
+    output_path = Path(sys.argv[1]) if len(sys.argv) > 1 else None
+    
+    print("Building pricing catalog from the AWS Pricing API...")
+    table = build_price_table()
+    path = write_price_table(table, output_path)
+    
+    ec2_count = sum(len(prices) for prices in table['ec2'].values())
+    print(f"Wrote {ec2_count} EC2 prices across {len(table['ec2'])} regions to {path}")
@@ -1,18 +1,53 @@
 """AWS Client Factory for centralized boto3 client management"""
 import boto3
-from typing import Optional
+from botocore.config import Config
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 from functools import lru_cache
 from core.config import settings
+import jmespath
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
+# Shared client configuration: a connection pool large enough for the
+# threaded fan-outs, kept-alive sockets so reused clients skip the TCP/TLS
+# handshake, and adaptive retries that also rate-limit the client itself
+# once AWS starts throttling it
+CLIENT_CONFIG = Config(
+    max_pool_connections=settings.aws_max_pool_connections,
+    tcp_keepalive=True,
+    retries={'total_max_attempts': settings.aws_max_attempts, 'mode': 'adaptive'}
+)
+
+# JMESPath fragment selecting a resource's Name tag, for boto3 projections
+NAME_TAG_PROJECTION = "(Tags[?Key=='Name'].Value | [0]) || 'N/A'"
+
+
+def search_pages(pages: Iterable[Dict[str, Any]], expression: jmespath.parser.ParsedResult) -> List[Any]:
+    """
+    Apply a precompiled JMESPath list projection to every page of a paginator
+    
+    Unlike PageIterator.search, the expression is parsed once at import time
+    rather than on every scan.
+    
+    Args:
+        pages: Paginator page iterator
+        expression: Compiled expression producing a list per page
+    
+    Returns:
+        Concatenated results of every page
+    """
+    return [item for page in pages for item in expression.search(page) or ()]
+
 
 class AWSClientFactory:
     """Factory class for creating and managing AWS service clients"""
     
     def __init__(self):
         self._session: Optional[boto3.Session] = None
+        self._clients: Dict[Tuple[str, Optional[str]], Any] = {}
+        self._clients_lock = threading.Lock()
     
     @property
     def session(self) -> boto3.Session:
@@ -30,23 +65,36 @@ class AWSClientFactory:
                 raise
         return self._session
     
-    def get_client(self, service_name: str):
+    def get_client(self, service_name: str, region_name: Optional[str] = None):
         """
-        Get a boto3 client for the specified AWS service
+        Get a shared boto3 client for the specified AWS service and region
+        
+        Clients are created once per (service, region) and reused; they are
+        thread-safe, but creating them is not, so creation is serialized.
         
         Args:
             service_name: Name of the AWS service (e.g., 'ec2', 's3', 'iam')
+            region_name: AWS region (optional, defaults to the session region)
             
         Returns:
             boto3 client for the specified service
         """
-        try:
-            client = self.session.client(service_name)
-            logger.debug(f"Created {service_name} client")
+        key = (service_name, region_name)
+        client = self._clients.get(key)
+        if client is not None:
             return client
-        except Exception as e:
-            logger.error(f"Failed to create {service_name} client: {e}")
-            raise
+        
+        with self._clients_lock:
+            client = self._clients.get(key)
+            if client is None:
+                try:
+                    client = self.session.client(service_name, region_name=region_name, config=CLIENT_CONFIG)
+                    self._clients[key] = client
+                    logger.debug(f"Created {service_name} client for region: {region_name or settings.aws_region}")
+                except Exception as e:
+                    logger.error(f"Failed to create {service_name} client: {e}")
+                    raise
+        return client
     
     def get_resource(self, service_name: str):
         """
@@ -74,21 +122,11 @@ def get_aws_client_factory() -> AWSClientFactory:
 
 
 # Convenience functions for getting specific clients
-def get_ec2_client():
-    """Get EC2 client"""
-    return get_aws_client_factory().get_client('ec2')
-
-
 def get_s3_client():
     """Get S3 client"""
     return get_aws_client_factory().get_client('s3')
 
 
-def get_ebs_client():
-    """Get EBS client (EC2 client is used for EBS operations)"""
-    return get_aws_client_factory().get_client('ec2')
-
-
 def get_iam_client():
     """Get IAM client"""
     return get_aws_client_factory().get_client('iam')
\ No newline at end of file
@@ -2,9 +2,11 @@
 from typing import Any, Optional, Callable
 from datetime import datetime, timedelta
 import logging
-from functools import wraps
+from functools import wraps, lru_cache
+import asyncio
 import hashlib
 import json
+from core.config import settings
 
 logger = logging.getLogger(__name__)
 
@@ -69,6 +71,9 @@ class SimpleCache:
 # Global cache instance
 _cache = SimpleCache()
 
+# Cache misses currently being computed, so concurrent callers share one call
+_inflight: dict[str, asyncio.Task] = {}
+
 
 def get_cache() -> SimpleCache:
     """Get the global cache instance"""
@@ -87,6 +92,30 @@ def cache_key(*args, **kwargs) -> str:
     return hashlib.md5(key_str.encode()).hexdigest()
 
 
+def function_cache_key(key_prefix: str, func: Callable, args: tuple, kwargs: dict) -> str:
+    """
+    Generate the cache key for a call to a cached function
+    
+    A region argument left unset is resolved to the configured region, so
+    default-region calls share entries with explicit ones, and the region
+    is kept readable in the key.
+    """
+    if 'region' in kwargs:
+        kwargs = {**kwargs, 'region': kwargs['region'] or settings.aws_region}
+        return f"{key_prefix}:{kwargs['region']}:{func.__name__}:{cache_key(*args, **kwargs)}"
+    return f"{key_prefix}:{func.__name__}:{cache_key(*args, **kwargs)}"
+
+
+async def _call_and_cache(func_key: str, ttl_minutes: int, func: Callable, args: tuple, kwargs: dict) -> Any:
+    """Await a cached coroutine function, store its result and clear its in-flight entry"""
+    try:
+        result = await func(*args, **kwargs)
+        _cache.set(func_key, result, timedelta(minutes=ttl_minutes))
+        return result
+    finally:
+        _inflight.pop(func_key, None)
+
+
 def cached(ttl_minutes: int = 5, key_prefix: str = ""):
     """
     Decorator to cache function results
@@ -99,22 +128,25 @@ def cached(ttl_minutes: int = 5, key_prefix: str = ""):
         @wraps(func)
         async def async_wrapper(*args, **kwargs):
             # Generate cache key
-            func_key = f"{key_prefix}:{func.__name__}:{cache_key(*args, **kwargs)}"
+            func_key = function_cache_key(key_prefix, func, args, kwargs)
             
             # Try to get from cache
             cached_value = _cache.get(func_key)
             if cached_value is not None:
                 return cached_value
             
-            # Call function and cache result
-            result = await func(*args, **kwargs)
-            _cache.set(func_key, result, timedelta(minutes=ttl_minutes))
-            return result
+            # Join a call already in flight for this key, or start one; shield it
+            # so a disconnecting caller does not cancel it for the others
+            task = _inflight.get(func_key)
+            if task is None:
+                task = asyncio.ensure_future(_call_and_cache(func_key, ttl_minutes, func, args, kwargs))
+                _inflight[func_key] = task
+            return await asyncio.shield(task)
         
         @wraps(func)
         def sync_wrapper(*args, **kwargs):
             # Generate cache key
-            func_key = f"{key_prefix}:{func.__name__}:{cache_key(*args, **kwargs)}"
+            func_key = function_cache_key(key_prefix, func, args, kwargs)
             
             # Try to get from cache
             cached_value = _cache.get(func_key)
@@ -143,17 +175,57 @@ def invalidate_cache(pattern: str) -> None:
 
 def clear_cache() -> None:
     """Clear all cache"""
+    _cache.clear()
+
+
+def get_shared(key: str) -> Optional[Any]:
+    """
+    Get a JSON value from the Redis cache shared by all API workers
+    
+    Falls back to the in-process cache if Redis is unavailable.
+    
+    Args:
+        key: Cache key
+    
+    Returns:
+        Cached value, or None on a miss
+    """
+    try:
+        raw = get_redis_client().get(key)
+        return json.loads(raw) if raw is not None else None
+    except Exception as e:
+        logger.warning(f"Redis cache unavailable for get {key}: {str(e)}")
+        return _cache.get(key)
+
+
+def set_shared(key: str, value: Any, ttl: timedelta) -> None:
+    """
+    Store a JSON-serializable value in the shared Redis cache
+    
+    Args:
+        key: Cache key
+        value: Value to store
+        ttl: Time before Redis evicts the key
+    """
+    try:
+        get_redis_client().setex(key, ttl, json.dumps(value, default=str))
+    except Exception as e:
+        logger.warning(f"Redis cache unavailable for set {key}: {str(e)}")
+        _cache.set(key, value, ttl)
 
 
+@lru_cache()
 def get_redis_client():
-    """Get Redis client for direct Redis operations"""
+    """Get shared Redis client for direct Redis operations"""
     import redis
-    from core.config import settings
     
     return redis.Redis(
         host=settings.redis_host,
         port=settings.redis_port,
         db=0,
-        decode_responses=False
+        decode_responses=False,
+        socket_keepalive=True,
+        socket_timeout=settings.redis_socket_timeout,
+        socket_connect_timeout=settings.redis_socket_timeout,
+        health_check_interval=30
     )
-    _cache.clear()
\ No newline at end of file
@@ -22,10 +22,23 @@ celery_app.conf.update(
     task_soft_time_limit=240,  # 4 minutes soft limit
     worker_prefetch_multiplier=1,
     worker_max_tasks_per_child=1000,
+    # Keep pooled broker connections alive between monitoring broadcasts
+    broker_transport_options={'socket_keepalive': True, 'health_check_interval': 30},
     # RedBeat configuration
     redbeat_redis_url=f"redis://{settings.redis_host}:{settings.redis_port}/1",
     beat_max_loop_interval=5,  # Check for schedule changes every 5 seconds
     imports=('core.tasks',),  # Import tasks module
+    beat_schedule={
+        'refresh-pricing-catalog': {
+            'task': 'core.tasks.refresh_pricing_catalog_task',
+            'schedule': timedelta(weeks=1),
+        },
+        # Rebuild before the 1 hour cost analysis cache entries go stale
+        'warm-cost-analysis': {
+            'task': 'core.tasks.warm_cost_analysis_task',
+            'schedule': timedelta(minutes=50),
+        },
+    },
 )
 
 # Autodiscover tasks
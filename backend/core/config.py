@@ -8,6 +8,8 @@ class Settings(BaseSettings):
     aws_access_key_id: str
     aws_secret_access_key: str
     aws_region: str = "ap-south-1"
+    aws_max_attempts: int = 10  # Total attempts per AWS call, including adaptive-mode retries
+    aws_max_pool_connections: int = 100  # HTTPS connections kept per AWS client
     
     # Notification Configuration
     slack_webhook_url: Optional[str] = None
@@ -21,10 +23,25 @@ class Settings(BaseSettings):
     # Redis Configuration
     redis_host: str = "redis"
     redis_port: int = 6379
+    redis_socket_timeout: float = 2.0  # Seconds before a Redis connect or command gives up
+    
+    # Celery Monitoring Configuration
+    celery_inspect_refresh_interval: float = 2.0  # Seconds between inspect() snapshots
+    celery_inspect_timeout: float = 0.3  # Seconds to wait for worker replies
+    
+    # Cost Analysis Configuration
+    pricing_catalog_path: Optional[str] = None  # Defaults to backend/pricing_catalog.json
+    cost_analysis_cache_ttl: int = 3600  # Seconds before a cached analysis is refreshed
+    
+    # IAM Configuration
+    iam_cache_ttl_minutes: int = 5  # Minutes the user and access key listings and IAM details are cached
+    iam_refresh_interval: float = 300.0  # Seconds between background IAM role and credential report snapshots
     
     # Server Configuration
     port: int = 8084
     host: str = "0.0.0.0"
+    workers: int = 1  # Uvicorn worker processes (ignored when debug reload is on)
+    aws_thread_pool_size: int = 100  # Threads for blocking boto3 calls, matches the client connection pool
     
     # Application Configuration
     app_name: str = "Cloud Cleaner API"
@@ -0,0 +1,180 @@
+"""Batchers that coalesce concurrent single-resource EC2 calls"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Union
+from botocore.exceptions import ClientError
+from core.aws_client import get_aws_client_factory
+import asyncio
+
+# EC2 accepts at most 200 values per filter
+FILTER_VALUES_LIMIT = 200
+
+
+class RegionBatcher(ABC):
+    """
+    Coalesce concurrent single-resource EC2 calls in a region into one call
+    
+    Requests arriving within the batch window share a single API call,
+    saving EC2 API throttling tokens when the dashboard opens or cleans up
+    many resources at once. A full batch is sent right away.
+    """
+    
+    def __init__(self, region: str, window: float = 0.3, max_batch: int = 500):
+        self.region = region
+        self.window = window
+        self.max_batch = max_batch
+        self._pending: Dict[str, List[asyncio.Future]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def get(self, resource_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Run the call for a resource as part of the next batch
+        
+        Args:
+            resource_id: The EC2 resource ID
+        
+        Returns:
+            The resource's entry in the call result, or None if it has none
+        
+        Raises:
+            Exception: The error for this resource, or for the whole batch
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.setdefault(resource_id, []).append(future)
+        
+        if len(self._pending) >= self.max_batch:
+            # Batch is full: replace the waiting timer with an immediate flush
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+            self._flush_task = asyncio.create_task(self._flush_after(0))
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after(self.window))
+        return await future
+    
+    async def _flush_after(self, delay: float) -> None:
+        """Wait for the batch window to close, then resolve every pending request"""
+        await asyncio.sleep(delay)
+        pending, self._pending = self._pending, {}
+        self._flush_task = None
+        
+        try:
+            results = await asyncio.to_thread(self._run, list(pending))
+        except Exception as e:
+            for futures in pending.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+        
+        for resource_id, futures in pending.items():
+            result = results.get(resource_id)
+            for future in futures:
+                if future.done():
+                    continue
+                if isinstance(result, Exception):
+                    future.set_exception(result)
+                else:
+                    future.set_result(result)
+    
+    @abstractmethod
+    def _run(self, resource_ids: List[str]) -> Dict[str, Union[Dict[str, Any], Exception]]:
+        """
+        Make the batched call
+        
+        Args:
+            resource_ids: EC2 resource IDs in the batch
+        
+        Returns:
+            Mapping of resource ID to its result, or to the error for that ID alone
+        """
+
+
+class VolumeDescribeBatcher(RegionBatcher):
+    """Batch describe_volumes lookups for a region"""
+    
+    def _run(self, resource_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Describe volumes by ID filter, so unknown IDs are omitted rather than failing the batch"""
+        paginator = get_aws_client_factory().get_client('ec2', self.region).get_paginator('describe_volumes')
+        volumes = {}
+        for i in range(0, len(resource_ids), FILTER_VALUES_LIMIT):
+            for page in paginator.paginate(
+                Filters=[{'Name': 'volume-id', 'Values': resource_ids[i:i + FILTER_VALUES_LIMIT]}],
+                PaginationConfig={'PageSize': 500}
+            ):
+                for volume in page.get('Volumes', []):
+                    volumes[volume['VolumeId']] = volume
+        return volumes
+
+
+class InstanceDescribeBatcher(RegionBatcher):
+    """Batch describe_instances lookups for a region"""
+    
+    def _run(self, resource_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Describe instances by ID filter, so unknown IDs are omitted rather than failing the batch"""
+        paginator = get_aws_client_factory().get_client('ec2', self.region).get_paginator('describe_instances')
+        instances = {}
+        for i in range(0, len(resource_ids), FILTER_VALUES_LIMIT):
+            for page in paginator.paginate(
+                Filters=[{'Name': 'instance-id', 'Values': resource_ids[i:i + FILTER_VALUES_LIMIT]}],
+                PaginationConfig={'PageSize': 1000}
+            ):
+                for reservation in page.get('Reservations', []):
+                    for instance in reservation.get('Instances', []):
+                        instances[instance['InstanceId']] = instance
+        return instances
+
+
+class TerminateBatcher(RegionBatcher):
+    """Batch terminate_instances requests for a region"""
+    
+    def _run(self, resource_ids: List[str]) -> Dict[str, Union[Dict[str, Any], Exception]]:
+        """
+        Terminate instances together, falling back to one call per instance
+        if the batch is rejected, so one protected or unknown instance only
+        fails its own request
+        """
+        client = get_aws_client_factory().get_client('ec2', self.region)
+        results: Dict[str, Union[Dict[str, Any], Exception]] = {}
+        # TerminateInstances accepts up to 1000 instance IDs
+        for i in range(0, len(resource_ids), 1000):
+            chunk = resource_ids[i:i + 1000]
+            try:
+                response = client.terminate_instances(InstanceIds=chunk)
+            except ClientError as e:
+                if len(chunk) == 1:
+                    results[chunk[0]] = e
+                    continue
+                for instance_id in chunk:
+                    results.update(self._run([instance_id]))
+                continue
+            for instance in response.get('TerminatingInstances', []):
+                results[instance['InstanceId']] = instance
+        return results
+
+
+_volume_batchers: Dict[str, VolumeDescribeBatcher] = {}
+_instance_batchers: Dict[str, InstanceDescribeBatcher] = {}
+_terminate_batchers: Dict[str, TerminateBatcher] = {}
+
+
+def get_volume_batcher(region: str) -> VolumeDescribeBatcher:
+    """Get the shared volume lookup batcher for a region"""
+    batcher = _volume_batchers.get(region)
+    if batcher is None:
+        batcher = _volume_batchers[region] = VolumeDescribeBatcher(region)
+    return batcher
+
+
+def get_instance_batcher(region: str) -> InstanceDescribeBatcher:
+    """Get the shared instance lookup batcher for a region"""
+    batcher = _instance_batchers.get(region)
+    if batcher is None:
+        batcher = _instance_batchers[region] = InstanceDescribeBatcher(region, window=0.2)
+    return batcher
+
+
+def get_terminate_batcher(region: str) -> TerminateBatcher:
+    """Get the shared instance termination batcher for a region"""
+    batcher = _terminate_batchers.get(region)
+    if batcher is None:
+        batcher = _terminate_batchers[region] = TerminateBatcher(region, max_batch=1000)
+    return batcher
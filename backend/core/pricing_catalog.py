@@ -0,0 +1,249 @@
+"""Static AWS price catalog for cost estimation
+
+The catalog is built from the AWS Pricing API by build_pricing_catalog.py (or
+the weekly refresh task) and loaded once at import, so cost estimates are
+dictionary lookups instead of Pricing API round trips. The weekly refresh
+runs on a Celery worker, so it also publishes the catalog to Redis, and API
+processes swap it in through sync_price_table.
+
+Layout (all prices in USD per month):
+    {
+        "ec2": {region: {instance_type: price_per_instance}},
+        "ebs": {region: {volume_api_name: price_per_gb}},
+        "s3": {region: price_per_gb}
+    }
+"""
+import logging
+import orjson
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Optional
+from core.aws_client import get_aws_client_factory
+from core.cache import get_redis_client
+from core.config import settings
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CATALOG_PATH = Path(__file__).resolve().parent.parent / "pricing_catalog.json"
+
+# Average hours per month used to convert hourly EC2 prices
+HOURS_PER_MONTH = 730
+
+# Region code to Pricing API location name
+REGION_NAMES = {
+    'us-east-1': 'US East (N. Virginia)',
+    'us-east-2': 'US East (Ohio)',
+    'us-west-1': 'US West (N. California)',
+    'us-west-2': 'US West (Oregon)',
+    'eu-west-1': 'EU (Ireland)',
+    'eu-central-1': 'EU (Frankfurt)',
+    'ap-southeast-1': 'Asia Pacific (Singapore)',
+    'ap-northeast-1': 'Asia Pacific (Tokyo)',
+}
+
+# Location used for unknown regions and for the (global) S3 list price
+DEFAULT_LOCATION = REGION_NAMES['us-east-1']
+
+EBS_VOLUME_TYPES = ('gp2', 'gp3', 'io1', 'io2', 'st1', 'sc1')
+
+# Shared Redis keys holding the latest refreshed catalog and its generation time
+PRICE_TABLE_KEY = 'cc:pricing:catalog'
+PRICE_VERSION_KEY = 'cc:pricing:generated_at'
+
+# Seconds between checks for a catalog published by another process
+PRICE_TABLE_CHECK_INTERVAL = 60
+
+
+def get_catalog_path() -> Path:
+    """Get the configured catalog location"""
+    return Path(settings.pricing_catalog_path) if settings.pricing_catalog_path else DEFAULT_CATALOG_PATH
+
+
+def load_price_table(path: Optional[Path] = None) -> Dict[str, Any]:
+    """
+    Load the price catalog from disk
+    
+    Args:
+        path: Catalog file (optional, defaults to the configured location)
+    
+    Returns:
+        Price table, or an empty dict if no catalog is available
+    """
+    path = path or get_catalog_path()
+    try:
+        with open(path, 'rb') as f:
+            table = orjson.loads(f.read())
+        logger.info(f"Loaded pricing catalog from {path} (generated {table.get('generated_at', 'unknown')})")
+        return table
+    except FileNotFoundError:
+        logger.info(f"No pricing catalog at {path}, falling back to live Pricing API lookups")
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load pricing catalog from {path}: {e}")
+    return {}
+
+
+def _on_demand_price(price_item: Dict[str, Any]) -> Optional[float]:
+    """Extract the first-tier on-demand USD price from a Pricing API product"""
+    for term in price_item.get('terms', {}).get('OnDemand', {}).values():
+        dimensions = term.get('priceDimensions', {}).values()
+        for dimension in sorted(dimensions, key=lambda d: float(d.get('beginRange', 0))):
+            usd = dimension.get('pricePerUnit', {}).get('USD')
+            if usd is not None:
+                return float(usd)
+    return None
+
+
+def parse_on_demand_price(price_list_item: str) -> Optional[float]:
+    """Parse one Pricing API PriceList entry and return its on-demand USD price"""
+    return _on_demand_price(orjson.loads(price_list_item))
+
+
+def _iter_products(pricing_client, service_code: str, filters: Dict[str, str]):
+    """Yield parsed Pricing API products matching the given TERM_MATCH filters"""
+    paginator = pricing_client.get_paginator('get_products')
+    pages = paginator.paginate(
+        ServiceCode=service_code,
+        Filters=[{'Type': 'TERM_MATCH', 'Field': field, 'Value': value} for field, value in filters.items()],
+        PaginationConfig={'PageSize': 100}
+    )
+    for page in pages:
+        for price_list_item in page.get('PriceList', []):
+            yield orjson.loads(price_list_item)
+
+
+def build_price_table() -> Dict[str, Any]:
+    """
+    Build the price catalog by walking the AWS Pricing API
+    
+    Returns:
+        Price table in the layout described in the module docstring
+    """
+    factory = get_aws_client_factory()
+    pricing_client = factory.get_client('pricing', 'us-east-1')
+    
+    table: Dict[str, Any] = {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'ec2': {},
+        'ebs': {},
+        's3': {}
+    }
+    
+    for region, location in REGION_NAMES.items():
+        # EC2 on-demand Linux instances
+        ec2_prices = {}
+        for product in _iter_products(pricing_client, 'AmazonEC2', {
+            'location': location,
+            'operatingSystem': 'Linux',
+            'tenancy': 'Shared',
+            'preInstalledSw': 'NA',
+            'capacitystatus': 'Used'
+        }):
+            instance_type = product.get('product', {}).get('attributes', {}).get('instanceType')
+            price = _on_demand_price(product)
+            if instance_type and price and instance_type not in ec2_prices:
+                ec2_prices[instance_type] = price * HOURS_PER_MONTH
+        table['ec2'][region] = ec2_prices
+        
+        # EBS storage per volume type
+        ebs_prices = {}
+        for volume_type in EBS_VOLUME_TYPES:
+            for product in _iter_products(pricing_client, 'AmazonEC2', {
+                'productFamily': 'Storage',
+                'volumeApiName': volume_type,
+                'location': location
+            }):
+                price = _on_demand_price(product)
+                if price:
+                    ebs_prices[volume_type] = price
+                    break
+        table['ebs'][region] = ebs_prices
+        
+        # S3 Standard storage (first tier)
+        for product in _iter_products(pricing_client, 'AmazonS3', {
+            'productFamily': 'Storage',
+            'storageClass': 'General Purpose',
+            'location': location
+        }):
+            price = _on_demand_price(product)
+            if price:
+                table['s3'][region] = price
+                break
+        
+        logger.info(f"Priced {len(ec2_prices)} instance types and {len(ebs_prices)} volume types in {region}")
+    
+    return table
+
+
+def write_price_table(table: Dict[str, Any], path: Optional[Path] = None) -> Path:
+    """Write the price catalog to disk atomically"""
+    path = path or get_catalog_path()
+    tmp_path = path.with_suffix(path.suffix + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        f.write(orjson.dumps(table, option=orjson.OPT_INDENT_2 | orjson.OPT_SORT_KEYS))
+    tmp_path.replace(path)
+    return path
+
+
+def publish_price_table(table: Dict[str, Any]) -> None:
+    """Publish the catalog to Redis for the API processes in other containers"""
+    redis_client = get_redis_client()
+    pipe = redis_client.pipeline()
+    pipe.set(PRICE_TABLE_KEY, orjson.dumps(table))
+    pipe.set(PRICE_VERSION_KEY, table['generated_at'])
+    pipe.execute()
+
+
+def _swap_price_table(table: Dict[str, Any]) -> None:
+    """Replace this process's catalog in place, so imported references see it"""
+    PRICE_TABLE.update(table)
+    for key in PRICE_TABLE.keys() - table.keys():
+        del PRICE_TABLE[key]
+
+
+def refresh_price_table(path: Optional[Path] = None) -> Dict[str, Any]:
+    """Rebuild the catalog, persist and publish it, and swap it into this process"""
+    table = build_price_table()
+    write_price_table(table, path)
+    publish_price_table(table)
+    _swap_price_table(table)
+    return table
+
+
+def sync_price_table() -> bool:
+    """
+    Swap in the catalog published to Redis if it differs from this process's
+    
+    Redis is checked at most once per PRICE_TABLE_CHECK_INTERVAL, and only
+    the version key is read unless a new catalog was published.
+    
+    Returns:
+        Whether a new catalog was loaded
+    """
+    global _last_sync
+    now = time.monotonic()
+    if now - _last_sync < PRICE_TABLE_CHECK_INTERVAL:
+        return False
+    _last_sync = now
+    
+    try:
+        redis_client = get_redis_client()
+        version = redis_client.get(PRICE_VERSION_KEY)
+        if version is None or version.decode('utf-8') == PRICE_TABLE.get('generated_at'):
+            return False
+        raw = redis_client.get(PRICE_TABLE_KEY)
+        if raw is None:
+            return False
+        table = orjson.loads(raw)
+    except Exception as e:
+        logger.warning(f"Could not check for a published pricing catalog: {e}")
+        return False
+    
+    _swap_price_table(table)
+    logger.info(f"Loaded published pricing catalog (generated {table.get('generated_at', 'unknown')})")
+    return True
+
+
+# Loaded once per process and refreshed by sync_price_table; lookups are plain dict gets
+PRICE_TABLE: Dict[str, Any] = load_price_table()
+_last_sync = float('-inf')
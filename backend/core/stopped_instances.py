@@ -0,0 +1,74 @@
+"""Selection of the EC2 instances reported as unused
+
+The EC2 listing, cost analysis and the scheduled scan all count the same
+instances: stopped through the EC2 API by a user more than a week ago.
+"""
+from datetime import datetime, timezone, timedelta
+from typing import Any, Dict, List, Optional
+from core.aws_client import search_pages
+import jmespath
+import re
+
+# Instances stopped through the EC2 API by a user, rather than shut down
+# from inside the instance; selected server side with describe_instances filters
+UNUSED_INSTANCE_FILTERS = [
+    {'Name': 'instance-state-name', 'Values': ['stopped']},
+    {'Name': 'state-reason-code', 'Values': ['Client.UserInitiatedShutdown']}
+]
+
+# Stop time recorded in StateTransitionReason, e.g. "User initiated (2024-01-15 10:23:00 GMT)"
+STOPPED_AT_PATTERN = re.compile(r'\((\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}) (?:GMT|UTC)\)')
+STOPPED_AT_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# Instances stopped more recently than this are not reported as unused
+UNUSED_AFTER = timedelta(days=7)
+
+# Minimal projection for callers that only count the instances
+STATE_REASON_EXPRESSION = jmespath.compile("Reservations[].Instances[].{state_reason: StateTransitionReason}")
+
+
+def stopped_at(state_reason: Optional[str]) -> Optional[str]:
+    """
+    Extract when an instance was stopped from its state transition reason
+    
+    The timestamp is fixed-width UTC, so it is returned as text and compared
+    against a cutoff in the same STOPPED_AT_FORMAT without parsing.
+    
+    Args:
+        state_reason: The instance's StateTransitionReason
+    
+    Returns:
+        Stop time in UTC, or None if the reason carries no timestamp
+    """
+    match = STOPPED_AT_PATTERN.search(state_reason or '')
+    return match.group(1) if match else None
+
+
+def fetch_unused_instances(
+    ec2_client,
+    expression: jmespath.parser.ParsedResult = STATE_REASON_EXPRESSION
+) -> List[Dict[str, Any]]:
+    """
+    Get the instances a user stopped more than UNUSED_AFTER ago
+    
+    When the stop time is not recorded, the instance is kept rather than
+    hiding a candidate.
+    
+    Args:
+        ec2_client: boto3 EC2 client for the region
+        expression: Compiled projection of each page's instances, which must
+            include a state_reason field (optional, defaults to only that field)
+    
+    Returns:
+        Projected instances
+    """
+    paginator = ec2_client.get_paginator('describe_instances')
+    pages = paginator.paginate(
+        Filters=UNUSED_INSTANCE_FILTERS,
+        PaginationConfig={'PageSize': 1000}
+    )
+    cutoff = (datetime.now(timezone.utc) - UNUSED_AFTER).strftime(STOPPED_AT_FORMAT)
+    return [
+        instance for instance in search_pages(pages, expression)
+        if (stopped := stopped_at(instance['state_reason'])) is None or stopped <= cutoff
+    ]
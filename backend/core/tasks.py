@@ -2,6 +2,8 @@ from celery import Task
 from core.celery_app import celery_app
 from core.config import settings
 from core.aws_client import get_aws_client_factory
+from core.pricing_catalog import refresh_price_table
+from core.stopped_instances import fetch_unused_instances
 import logging
 import smtplib
 from email.mime.text import MIMEText
@@ -12,6 +14,10 @@ from typing import Dict, Any, List, Optional
 
 logger = logging.getLogger(__name__)
 
+# Shared HTTP session, so repeated Slack posts from a worker reuse the
+# kept-alive connection to the webhook host instead of a new TLS handshake
+SLACK_SESSION = requests.Session()
+
 
 def fetch_all_regions_data() -> Dict[str, Any]:
     """
@@ -24,7 +30,7 @@ def fetch_all_regions_data() -> Dict[str, Any]:
         factory = get_aws_client_factory()
         
         # Get list of all enabled regions
-        ec2_client = factory.session.client('ec2', region_name=settings.aws_region)
+        ec2_client = factory.get_client('ec2', settings.aws_region)
         regions_response = ec2_client.describe_regions(
             Filters=[{'Name': 'opt-in-status', 'Values': ['opt-in-not-required', 'opted-in']}]
         )
@@ -40,30 +46,22 @@ def fetch_all_regions_data() -> Dict[str, Any]:
         # Scan each region
         for region in regions:
             try:
-                regional_ec2_client = factory.session.client('ec2', region_name=region)
-                
-                # Get stopped EC2 instances
-                ec2_response = regional_ec2_client.describe_instances(
-                    Filters=[{'Name': 'instance-state-name', 'Values': ['stopped']}]
-                )
+                regional_ec2_client = factory.get_client('ec2', region)
                 
-                ec2_count = 0
-                for reservation in ec2_response.get('Reservations', []):
-                    for instance in reservation.get('Instances', []):
-                        state_transition_reason = instance.get('StateTransitionReason', '')
-                        if 'User initiated' in state_transition_reason:
-                            ec2_count += 1
+                # Count EC2 instances stopped by a user over a week ago, across every page
+                ec2_count = len(fetch_unused_instances(regional_ec2_client))
                 
                 if ec2_count > 0:
                     ec2_by_region[region] = ec2_count
                     total_ec2 += ec2_count
                 
-                # Get unattached EBS volumes
-                ebs_response = regional_ec2_client.describe_volumes(
-                    Filters=[{'Name': 'status', 'Values': ['available']}]
+                # Get unattached EBS volumes, across every page
+                ebs_pages = regional_ec2_client.get_paginator('describe_volumes').paginate(
+                    Filters=[{'Name': 'status', 'Values': ['available']}],
+                    PaginationConfig={'PageSize': 500}
                 )
                 
-                ebs_count = len(ebs_response.get('Volumes', []))
+                ebs_count = sum(len(page.get('Volumes', [])) for page in ebs_pages)
                 if ebs_count > 0:
                     ebs_by_region[region] = ebs_count
                     total_ebs += ebs_count
@@ -174,7 +172,7 @@ def send_slack_notification(webhook_url: str, message: str, resource_data: Dict[
             ]
         }
         
-        response = requests.post(webhook_url, json=payload, timeout=10)
+        response = SLACK_SESSION.post(webhook_url, json=payload, timeout=10)
         response.raise_for_status()
         logger.info("Slack notification sent successfully")
         return True
@@ -346,7 +344,7 @@ def send_alert_task(
         # Fetch unused access keys (global) - SECURITY CRITICAL
         try:
             factory = get_aws_client_factory()
-            iam_client = factory.session.client('iam')
+            iam_client = factory.get_client('iam')
             paginator = iam_client.get_paginator('list_users')
             unused_access_keys = []
             high_risk_keys = 0
@@ -459,7 +457,7 @@ def scheduled_scan_task(self: Task) -> Dict[str, Any]:
         # Fetch S3 buckets (global) - only unused ones
         try:
             factory = get_aws_client_factory()
-            s3_client = factory.session.client('s3')
+            s3_client = factory.get_client('s3')
             s3_response = s3_client.list_buckets()
             
             # Filter for unused buckets (same logic as /api/s3/unused)
@@ -490,7 +488,7 @@ def scheduled_scan_task(self: Task) -> Dict[str, Any]:
         
         # Fetch IAM users (global)
         try:
-            iam_client = factory.session.client('iam')
+            iam_client = factory.get_client('iam')
             iam_response = iam_client.list_users()
             iam_users_count = len(iam_response.get('Users', []))
         except Exception as e:
@@ -611,4 +609,109 @@ def scheduled_scan_task(self: Task) -> Dict[str, Any]:
         
     except Exception as e:
         logger.error(f"Error in scheduled scan task: {str(e)}")
-        raise self.retry(exc=e, countdown=300)  # Retry after 5 minutes
\ No newline at end of file
+        raise self.retry(exc=e, countdown=300)  # Retry after 5 minutes
+
+
+@celery_app.task(bind=True, name="core.tasks.refresh_pricing_catalog_task")
+def refresh_pricing_catalog_task(self: Task) -> Dict[str, Any]:
+    """
+    Weekly task to rebuild the static price catalog from the AWS Pricing API
+    
+    Returns:
+        Dictionary with catalog generation time and entry counts
+    """
+    try:
+        logger.info("Refreshing pricing catalog...")
+        table = refresh_price_table()
+        
+        result = {
+            'generated_at': table['generated_at'],
+            'ec2_prices': sum(len(prices) for prices in table['ec2'].values()),
+            'ebs_prices': sum(len(prices) for prices in table['ebs'].values()),
+            's3_prices': len(table['s3'])
+        }
+        logger.info(f"Pricing catalog refreshed: {result}")
+        return result
+    
+    except Exception as e:
+        logger.error(f"Error refreshing pricing catalog: {str(e)}")
+        raise
+
+
+@celery_app.task(bind=True, name="core.tasks.warm_cost_analysis_task")
+def warm_cost_analysis_task(self: Task) -> Dict[str, Any]:
+    """
+    Periodic task to rebuild cached cost analyses before they go stale
+    
+    Refreshes the default region plus every region requested within the
+    last COST_ANALYSIS_CACHE_TTL, so /cost-analysis requests are served
+    from a warm entry without rebuilding regions nobody reads anymore.
+    
+    Returns:
+        Dictionary with the regions refreshed and any that failed
+    """
+    import asyncio
+    from core.cache import get_redis_client
+    from api.cost_analysis import COST_READ_PREFIX, build_cost_analysis, store_cost_analysis
+    
+    regions = {'us-east-1'}
+    try:
+        redis_client = get_redis_client()
+        for key in redis_client.scan_iter(match=f"{COST_READ_PREFIX}*"):
+            regions.add(key.decode('utf-8')[len(COST_READ_PREFIX):])
+    except Exception as e:
+        logger.warning(f"Could not list recently requested cost analysis regions: {str(e)}")
+    
+    refreshed = []
+    failed = []
+    for region in sorted(regions):
+        try:
+            store_cost_analysis(region, asyncio.run(build_cost_analysis(region)))
+            refreshed.append(region)
+        except Exception as e:
+            logger.error(f"Error warming cost analysis for {region}: {str(e)}")
+            failed.append(region)
+    
+    logger.info(f"Cost analysis cache warmed for {refreshed}")
+    return {'refreshed': refreshed, 'failed': failed}
+
+
+@celery_app.task(bind=True, name="core.tasks.render_cost_pdf_task")
+def render_cost_pdf_task(self: Task, region: str = 'us-east-1') -> Dict[str, Any]:
+    """
+    Render the cost analysis PDF on a worker and store it in Redis
+    
+    The PDF is kept for an hour under cc:pdf:<task_id> and downloaded through
+    GET /api/cost-analysis/export/pdf/{task_id}.
+    
+    Args:
+        region: AWS region to report on
+    
+    Returns:
+        Dictionary with the region and PDF size
+    """
+    import asyncio
+    from core.cache import get_redis_client, get_shared
+    from api.cost_analysis import (
+        PDF_CACHE_PREFIX, build_cost_analysis, build_cost_pdf, cost_cache_key, store_cost_analysis
+    )
+    
+    try:
+        logger.info(f"Rendering cost analysis PDF for {region}")
+        
+        # Reuse the cached analysis when the API already has one
+        entry = get_shared(cost_cache_key(region))
+        if entry:
+            cost_data = entry['data']
+        else:
+            cost_data = asyncio.run(build_cost_analysis(region))
+            store_cost_analysis(region, cost_data)
+        
+        pdf_bytes = build_cost_pdf(cost_data, region)
+        get_redis_client().setex(f"{PDF_CACHE_PREFIX}{self.request.id}", timedelta(hours=1), pdf_bytes)
+        
+        return {'region': region, 'size_bytes': len(pdf_bytes)}
+    
+    except Exception as e:
+        logger.error(f"Error rendering cost analysis PDF: {str(e)}")
+        raise
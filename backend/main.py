@@ -1,10 +1,12 @@
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import RedirectResponse
+from fastapi.responses import ORJSONResponse, RedirectResponse
 from api import ec2, ebs, s3, iam, notifications, celery_monitor, schedule, cost_analysis
 from core.config import settings
 from core.aws_client import get_aws_client_factory
 from core.cache import cached
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import logging
 import sys
 
@@ -24,7 +26,8 @@ app = FastAPI(
     title=settings.app_name,
     description="API for identifying and managing unused AWS resources",
     version="1.0.0",
-    debug=settings.debug
+    debug=settings.debug,
+    default_response_class=ORJSONResponse
 )
 
 # Configure CORS
@@ -49,7 +52,14 @@ app.include_router(cost_analysis.router, prefix="/api", tags=["Cost Analysis"])
 
 @app.on_event("startup")
 async def startup_event():
-    """Log startup information"""
+    """Log startup information and start background refreshers"""
+    # Blocking boto3 calls run via asyncio.to_thread; size its pool to the
+    # shared client connection pool instead of the small CPU-based default
+    asyncio.get_running_loop().set_default_executor(
+        ThreadPoolExecutor(max_workers=settings.aws_thread_pool_size, thread_name_prefix="aws")
+    )
+    celery_monitor.start_inspect_refresher()
+    iam.start_snapshot_refresher()
     logger.info(f"Starting {settings.app_name}")
     logger.info(f"AWS Region: {settings.aws_region}")
     logger.info(f"Server running on {settings.host}:{settings.port}")
@@ -58,7 +68,9 @@ async def startup_event():
 
 @app.on_event("shutdown")
 async def shutdown_event():
-    """Log shutdown information"""
+    """Log shutdown information and stop background refreshers"""
+    await celery_monitor.stop_inspect_refresher()
+    await iam.stop_snapshot_refresher()
     logger.info(f"Shutting down {settings.app_name}")
 
 
@@ -101,10 +113,10 @@ async def get_regions():
     try:
         # Get EC2 client to fetch regions
         factory = get_aws_client_factory()
-        ec2_client = factory.session.client('ec2', region_name=settings.aws_region)
+        ec2_client = factory.get_client('ec2', settings.aws_region)
         
         # Describe all available regions
-        response = ec2_client.describe_regions(AllRegions=False)  # Only enabled regions
+        response = await asyncio.to_thread(ec2_client.describe_regions, AllRegions=False)  # Only enabled regions
         
         regions = []
         for region in response.get('Regions', []):
@@ -146,5 +158,8 @@ if __name__ == "__main__":
         host=settings.host,
         port=settings.port,
         reload=settings.debug,
+        workers=settings.workers,
+        loop="uvloop",
+        http="httptools",
         log_level="info" if not settings.debug else "debug"
     )